@@ -2,10 +2,22 @@
 Alarm Manager - Load and manage alarm configurations
 """
 
+import copy
+import hashlib
+import sys
 import yaml
 from pathlib import Path
 from typing import Dict, List, Any
 
+# Prefer LibYAML's C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# Parsed configs keyed by path, invalidated when the file's mtime changes
+_CACHE: Dict[Path, tuple] = {}
+
 class AlarmManager:
     """Manages alarm configurations and priorities"""
     
@@ -22,27 +34,91 @@ class AlarmManager:
         self.config_path = Path(config_path)
         self.config = self._load_config()
         self.led_patterns = self.config.get('led_patterns', {})
+        # Colors are immutable RGB triples; convert YAML lists once
+        for pattern_def in self.led_patterns.values():
+            if 'color' in pattern_def:
+                pattern_def['color'] = tuple(pattern_def['color'])
         self.alarms = self.config.get('alarms', {})
         self.diagnostics_config = self.config.get('diagnostics', {})
         self.gpio_config = self.config.get('gpio', {})
         self.boot_config = self.config.get('boot', {})
+        
+        # Config is immutable after load, so build lookup indexes once
+        self._enabled_alarms = {
+            name: alarm
+            for name, alarm in self.alarms.items()
+            if alarm.get('enabled', True)
+        }
+        self._by_check = {}
+        for alarm in self._enabled_alarms.values():
+            if 'check' in alarm and 'condition' in alarm:
+                # First definition wins, matching the old linear scan
+                self._by_check.setdefault((alarm['check'], alarm['condition']), alarm)
+        self._all_ok = self._by_check.get(('all', 'ok'))
+        # (priority, check, condition, alarm), highest priority first, so the
+        # first match against diagnostic results is the winner
+        self._checks_by_priority = sorted(
+            (
+                (alarm.get('priority', 0), check, condition, alarm)
+                for (check, condition), alarm in self._by_check.items()
+                if alarm.get('priority', 0) > 0
+            ),
+            key=lambda x: x[0],
+            reverse=True
+        )
+        
+        # Resolve LED patterns once instead of rebuilding dicts per call
+        self._resolved_patterns = {
+            name: self._resolve_pattern(name, pattern_def)
+            for name, pattern_def in self.led_patterns.items()
+        }
+        self._boot_pattern = self._resolve_boot_pattern()
+        
+        self._sorted_by_priority = sorted(
+            self._enabled_alarms.items(),
+            key=lambda x: x[1].get('priority', 0),
+            reverse=True
+        )
     
     def _load_config(self) -> Dict:
-        """Load alarm configuration from YAML file"""
+        """Load alarm configuration from YAML file (cached on file mtime)"""
         try:
-            with open(self.config_path, 'r') as f:
-                return yaml.safe_load(f)
+            mtime = self.config_path.stat().st_mtime_ns
+            cached = _CACHE.get(self.config_path)
+            if cached is not None and cached[0] == mtime:
+                return copy.deepcopy(cached[1])
+            
+            with open(self.config_path, 'rb') as f:
+                raw = f.read()
+            config = self._load_compiled(raw)
+            if config is None:
+                config = yaml.load(raw, Loader=_SafeLoader) or {}
+            _CACHE[self.config_path] = (mtime, config)
+            return copy.deepcopy(config)
         except Exception as e:
             print(f"Error loading alarm config: {e}")
             return {}
     
+    @staticmethod
+    def _load_compiled(raw: bytes):
+        """
+        Return the precompiled config if it was built from this exact YAML
+        
+        See scripts/setup/compile_alarm_config.py. Returns None when the
+        module is missing or stale, so the caller parses the YAML instead.
+        """
+        try:
+            from . import _alarm_config_compiled as compiled
+        except ImportError:
+            return None
+        if compiled.SOURCE_SHA1 != hashlib.sha1(raw).hexdigest():
+            return None
+        return compiled.ALARM_CONFIG
+    
     def get_enabled_alarms(self) -> Dict[str, Dict]:
         """Get all enabled alarms"""
-        return {
-            name: alarm 
-            for name, alarm in self.alarms.items() 
-            if alarm.get('enabled', True)
-        }
+        # Copy so callers can't change the cached set for later calls
+        return dict(self._enabled_alarms)
     
     def get_alarm_by_check(self, check: str, condition: str) -> Dict:
         """
@@ -55,10 +131,7 @@ class AlarmManager:
         Returns:
             Alarm configuration dict or None
         """
-        for name, alarm in self.get_enabled_alarms().items():
-            if alarm.get('check') == check and alarm.get('condition') == condition:
-                return alarm
-        return None
+        return self._by_check.get((check, condition))
     
     def get_highest_priority_alarm(self, diagnostic_results: Dict) -> tuple:
         """
@@ -71,31 +144,37 @@ class AlarmManager:
         Returns:
             Tuple of (alarm_name, alarm_config) or (None, None)
         """
-        highest_priority = 0
-        highest_alarm = None
-        highest_name = None
+        for _, check_name, condition, alarm in self._checks_by_priority:
+            result = diagnostic_results.get(check_name)
+            if result is not None and result.get('status', 'unknown') == condition:
+                return f"{check_name}_{condition}", alarm
         
-        # Check each diagnostic result against alarm conditions
-        for check_name, result in diagnostic_results.items():
-            status = result.get('status', 'unknown')
-            
-            # Find matching alarm
-            alarm = self.get_alarm_by_check(check_name, status)
-            if alarm:
-                priority = alarm.get('priority', 0)
-                if priority > highest_priority:
-                    highest_priority = priority
-                    highest_alarm = alarm
-                    highest_name = f"{check_name}_{status}"
-        
-        # If no specific alarm found, check for "all ok"
-        if highest_alarm is None:
-            all_ok = self.get_alarm_by_check('all', 'ok')
-            if all_ok:
-                highest_alarm = all_ok
-                highest_name = 'all_ok'
-        
-        return highest_name, highest_alarm
+        # If no specific alarm found, fall back to "all ok"
+        if self._all_ok is not None:
+            return 'all_ok', self._all_ok
+        return None, None
+    
+    def _resolve_pattern(self, pattern_name: str, pattern_def: Dict) -> Dict:
+        """Build a resolved LED pattern dict with defaults applied"""
+        return {
+            'pattern': pattern_name,
+            'color': pattern_def.get('color', (0, 255, 0)),
+            'blink': pattern_def.get('blink', False),
+            'blink_rate': pattern_def.get('blink_rate', 0.5),
+            'description': pattern_def.get('description', '')
+        }
+    
+    def _resolve_boot_pattern(self) -> Dict:
+        """Build the boot diagnostic LED pattern dict with defaults applied"""
+        pattern_name = self.boot_config.get('diagnostic_pattern', 'diagnostic_blink')
+        pattern_def = self.led_patterns.get(pattern_name, {})
+        
+        return {
+            'pattern': pattern_name,
+            'color': pattern_def.get('color', (255, 255, 0)),
+            'blink': pattern_def.get('blink', True),
+            'blink_rate': pattern_def.get('blink_rate', 0.3)
+        }
     
     def get_led_pattern(self, alarm: Dict) -> Dict:
         """
@@ -105,20 +184,14 @@ class AlarmManager:
         Returns:
             Dict with keys: pattern, color (RGB tuple), blink, blink_rate
         """
-        # Get pattern name from alarm
         pattern_name = alarm.get('pattern', 'ok_solid')
         
-        # Look up pattern definition
-        pattern_def = self.led_patterns.get(pattern_name, {})
-        
-        # Return resolved pattern with defaults
-        return {
-            'pattern': pattern_name,
-            'color': tuple(pattern_def.get('color', [0, 255, 0])),
-            'blink': pattern_def.get('blink', False),
-            'blink_rate': pattern_def.get('blink_rate', 0.5),
-            'description': pattern_def.get('description', '')
-        }
+        resolved = self._resolved_patterns.get(pattern_name)
+        if resolved is None:
+            # Unknown pattern: fall back to defaults
+            return self._resolve_pattern(pattern_name, {})
+        # Copy so a caller tweaking the result doesn't change the cached one
+        return dict(resolved)
     
     def get_boot_pattern(self) -> Dict:
         """
@@ -127,15 +200,7 @@ class AlarmManager:
         Returns:
             Dict with LED pattern configuration
         """
-        pattern_name = self.boot_config.get('diagnostic_pattern', 'diagnostic_blink')
-        pattern_def = self.led_patterns.get(pattern_name, {})
-        
-        return {
-            'pattern': pattern_name,
-            'color': tuple(pattern_def.get('color', [255, 255, 0])),
-            'blink': pattern_def.get('blink', True),
-            'blink_rate': pattern_def.get('blink_rate', 0.3)
-        }
+        return dict(self._boot_pattern)
     
     def get_diagnostic_config(self, check_name: str) -> Dict:
         """Get configuration for a specific diagnostic check"""
@@ -168,48 +233,47 @@ class AlarmManager:
         Returns:
             List of (alarm_name, alarm_config) tuples
         """
-        alarms = self.get_enabled_alarms()
-        return sorted(
-            alarms.items(),
-            key=lambda x: x[1].get('priority', 0),
-            reverse=True
-        )
+        return list(self._sorted_by_priority)
     
     def print_alarm_summary(self):
         """Print a summary of all configured alarms"""
-        print("=" * 70)
-        print("ALARM CONFIGURATION SUMMARY")
-        print("=" * 70)
-        print()
-        
-        print("LED Patterns:")
+        # Build the whole report first and write it in one call
+        lines = [
+            "=" * 70,
+            "ALARM CONFIGURATION SUMMARY",
+            "=" * 70,
+            "",
+            "LED Patterns:",
+        ]
         for pattern_name, pattern_def in self.led_patterns.items():
-            color = pattern_def.get('color', [0, 0, 0])
+            color = pattern_def.get('color', (0, 0, 0))
             blink = "Blinking" if pattern_def.get('blink') else "Solid"
             desc = pattern_def.get('description', '')
-            print(f"  {pattern_name:20s} → {blink:8s} RGB{tuple(color)} - {desc}")
-        print()
+            lines.append(f"  {pattern_name:20s} → {blink:8s} RGB{color} - {desc}")
+        lines.append("")
         
-        print("GPIO Configuration:")
+        lines.append("GPIO Configuration:")
         for pin_name, pin_num in self.get_gpio_pins().items():
-            print(f"  {pin_name.upper():6s}: GPIO {pin_num}")
-        print()
+            lines.append(f"  {pin_name.upper():6s}: GPIO {pin_num}")
+        lines.append("")
         
-        print("Alarms (by priority):")
-        for name, alarm in self.list_alarms_by_priority():
+        lines.append("Alarms (by priority):")
+        for name, alarm in self._sorted_by_priority:
             priority = alarm.get('priority', 0)
             pattern = alarm.get('pattern', 'unknown')
             message = alarm.get('message', '')
             critical = "CRITICAL" if alarm.get('critical') else "WARNING"
-            print(f"  [{priority:3d}] {name:25s} → {pattern:20s} ({critical})")
-            print(f"        {message}")
-        print()
+            lines.append(f"  [{priority:3d}] {name:25s} → {pattern:20s} ({critical})")
+            lines.append(f"        {message}")
+        lines.append("")
         
-        print("Diagnostic Checks:")
+        lines.append("Diagnostic Checks:")
         for check_name, config in self.diagnostics_config.items():
             enabled = "✓" if config.get('enabled', True) else "✗"
-            print(f"  {enabled} {check_name}")
-        print("=" * 70)
+            lines.append(f"  {enabled} {check_name}")
+        lines.append("=" * 70)
+        
+        sys.stdout.write("\n".join(lines) + "\n")
 
 # Convenience function
 def load_alarm_config(config_path: str = None) -> AlarmManager:
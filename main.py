@@ -12,21 +12,25 @@ Usage:
 """
 
 import argparse
-import logging
+import os
 import sys
-from pathlib import Path
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent))
+# Everything else (logging, OpenCV, Hailo, Flask, face_recognition) is imported
+# only after argument parsing, inside the branch for the selected mode, so
+# --help and argument errors exit without paying for it
 
 
 def setup_logging(log_level="INFO", log_file=None):
     """Configure logging"""
+    import logging
+    
     log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     
     handlers = [logging.StreamHandler(sys.stdout)]
     if log_file:
-        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        log_dir = os.path.dirname(log_file)
+        if log_dir and not os.path.isdir(log_dir):
+            os.makedirs(log_dir, exist_ok=True)
         handlers.append(logging.FileHandler(log_file))
     
     logging.basicConfig(
@@ -124,6 +128,7 @@ def main():
         args.cameras = [args.single_camera]
     
     # Setup logging
+    import logging
     setup_logging(args.log_level, args.log_file)
     logger = logging.getLogger('skipper')
     
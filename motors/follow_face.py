@@ -85,6 +85,10 @@ STREAM_QUALITY = 70       # JPEG quality (lower = faster)
 STREAM_WIDTH = 640        # resize width for stream; 0 = keep original
 
 app = Flask(__name__)
+
+# Multipart framing around each streamed JPEG; joined in one allocation
+MJPEG_PART_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+MJPEG_PART_TRAILER = b"\r\n"
 _latest_jpeg = None
 _latest_lock = threading.Lock()
 
@@ -106,14 +110,13 @@ def _set_stream_frame(bgr_frame):
 
 
 def _mjpeg_generator():
-    boundary = b"--frame"
     while True:
         with _latest_lock:
             jpg = _latest_jpeg
         if jpg is None:
             time.sleep(0.03)
             continue
-        yield boundary + b"\r\nContent-Type: image/jpeg\r\n\r\n" + jpg + b"\r\n"
+        yield b"".join((MJPEG_PART_HEADER, jpg, MJPEG_PART_TRAILER))
         time.sleep(0.03)
 
 
@@ -826,6 +829,8 @@ def main():
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_W)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_H)
     cap.set(cv2.CAP_PROP_FPS, FPS)
+    # Track on the newest frame, not one queued while the last was processed
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
     if not cap.isOpened():
         enable_drivers(False)
         raise RuntimeError(f"Could not open /dev/video{CAP_INDEX}")
@@ -1003,7 +1008,7 @@ def main():
             # ):
             #     enable_drivers(False)
 
-            time.sleep(0.01)
+            # No pacing sleep: cap.read() already blocks until the next frame
 
     except KeyboardInterrupt:
         print("\nStopping…")
@@ -9,7 +9,8 @@ but uses Klipper + Octopus board instead of direct GPIO.
 
 import time
 import threading
-import urllib.request
+import http.client
+import queue
 import urllib.parse
 import urllib.error
 import json
@@ -28,7 +29,24 @@ class KlipperMotorController:
         self.base_url = base_url
         self.azimuth_pos = 0.0
         self.altitude_pos = 0.0
-        self.lock = threading.Lock()
+        # One lock per axis so azimuth and altitude updates never wait on each
+        # other; anything touching both takes them in az -> alt order
+        self._az_lock = threading.Lock()
+        self._alt_lock = threading.Lock()
+        
+        # One kept-alive connection to Moonraker, so TCP setup is paid once
+        url = urllib.parse.urlsplit(base_url)
+        self._host = url.hostname
+        self._port = url.port
+        self._api_root = url.path.rstrip("/")
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        
+        # Motion commands are sent by a background thread so callers never
+        # wait on the HTTP round-trip; newer targets supersede the oldest
+        self._cmd_q = queue.Queue(maxsize=8)
+        self._sender = threading.Thread(target=self._sender_loop, name="klipper-sender", daemon=True)
+        self._sender.start()
         
         # Motion limits (can be calibrated)
         self.azimuth_min = azimuth_min
@@ -36,35 +54,163 @@ class KlipperMotorController:
         self.altitude_min = altitude_min
         self.altitude_max = altitude_max
         
-    def _send_gcode(self, command: str, timeout: int = 5) -> dict:
-        """Send G-code command to Klipper."""
-        url = f"{self.base_url}/printer/gcode/script"
-        data = urllib.parse.urlencode({"script": command}).encode()
+    def _request(self, method: str, path: str, data: Optional[dict] = None,
+                 timeout: int = 5) -> dict:
+        """
+        Make a Moonraker API request over the shared kept-alive connection.
+        
+        Raises on connection or HTTP errors; returns the decoded JSON body.
+        """
+        body = urllib.parse.urlencode(data) if data is not None else None
+        headers = {"Content-Type": "application/x-www-form-urlencoded"} if data is not None else {}
         
+        with self._conn_lock:
+            # A reused connection may have been closed by the server while
+            # idle; retry once on a fresh one in that case
+            for reused in (self._conn is not None, False):
+                try:
+                    if self._conn is None:
+                        self._conn = http.client.HTTPConnection(self._host, self._port, timeout=timeout)
+                    elif self._conn.sock is not None:
+                        self._conn.sock.settimeout(timeout)
+                    self._conn.request(method, self._api_root + path, body=body, headers=headers)
+                    response = self._conn.getresponse()
+                    payload = response.read()
+                except (http.client.RemoteDisconnected, ConnectionError):
+                    self._close_conn()
+                    if not reused:
+                        raise
+                    continue
+                except Exception:
+                    self._close_conn()
+                    raise
+                
+                if response.status >= 400:
+                    raise urllib.error.HTTPError(self.base_url + path, response.status,
+                                                 response.reason, response.headers, None)
+                return json.loads(payload.decode())
+    
+    def _send_gcode(self, command: str, timeout: int = 5) -> dict:
+        """Send G-code command (one or more lines) to Klipper."""
         try:
-            with urllib.request.urlopen(url, data=data, timeout=timeout) as response:
-                return json.loads(response.read().decode())
+            return self._request("POST", "/printer/gcode/script", {"script": command}, timeout)
         except Exception as e:
             # Silently fail for non-critical commands
             return {"error": str(e)}
     
+    def _queue_gcode(self, command: str, axis: Optional[str] = None):
+        """
+        Queue a G-code command for the sender thread and return immediately.
+        
+        Args:
+            command: G-code script
+            axis: "azimuth", "altitude" or "both" for moves that a later move
+                  of the same axis supersedes; None for ordered commands
+        """
+        if axis is None:
+            # Ordered commands are never dropped; wait for room instead
+            self._cmd_q.put((axis, command))
+            return
+        while True:
+            try:
+                self._cmd_q.put_nowait((axis, command))
+                return
+            except queue.Full:
+                if not self._discard_superseded(axis):
+                    # Nothing this move supersedes (e.g. the queue is all
+                    # ordered commands): wait for room like they do
+                    self._cmd_q.put((axis, command))
+                    return
+    
+    def _discard_superseded(self, axis: str) -> bool:
+        """
+        Drop the oldest queued move that a new move of axis makes redundant.
+        
+        Same rules as _coalesce: only moves after the last ordered command
+        are candidates, and "both" supersedes either axis. Returns False if
+        there was nothing to drop.
+        """
+        covers = ("azimuth", "altitude", "both") if axis == "both" else (axis,)
+        q = self._cmd_q
+        with q.mutex:
+            start = len(q.queue)
+            while start > 0 and q.queue[start - 1][0] is not None:
+                start -= 1
+            for i in range(start, len(q.queue)):
+                if q.queue[i][0] in covers:
+                    del q.queue[i]
+                    q.unfinished_tasks -= 1
+                    q.not_full.notify()
+                    return True
+        return False
+    
+    def _discard_oldest(self):
+        try:
+            self._cmd_q.get_nowait()
+            self._cmd_q.task_done()
+        except queue.Empty:
+            pass
+    
+    def _sender_loop(self):
+        while True:
+            batch = [self._cmd_q.get()]
+            while True:
+                try:
+                    batch.append(self._cmd_q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                for command in self._coalesce(batch):
+                    self._send_gcode(command)
+            finally:
+                for _ in batch:
+                    self._cmd_q.task_done()
+    
+    @staticmethod
+    def _coalesce(batch):
+        """
+        Collapse pending moves to the latest target per axis.
+        
+        Each MANUAL_STEPPER MOVE blocks until the motion completes, so sending
+        every queued target makes the head chase stale positions. Ordered
+        commands (axis None) act as barriers that moves are never merged across.
+        """
+        pending = []
+        for axis, command in batch:
+            if axis is not None:
+                covers = ("azimuth", "altitude", "both") if axis == "both" else (axis,)
+                start = len(pending)
+                while start > 0 and pending[start - 1][0] is not None:
+                    start -= 1
+                pending[start:] = [p for p in pending[start:] if p[0] not in covers]
+            pending.append((axis, command))
+        return [command for _, command in pending]
+    
+    def flush(self):
+        """Block until every queued command has been sent to Klipper."""
+        self._cmd_q.join()
+    
+    def _close_conn(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
     def initialize(self) -> bool:
         """Initialize Klipper connection and set home position."""
         try:
-            url = f"{self.base_url}/printer/info"
-            with urllib.request.urlopen(url, timeout=5) as response:
-                data = json.loads(response.read().decode())
-                state = data.get("result", {}).get("state", "")
-                
-                if state == "ready":
-                    # For manual steppers, enable them and set starting position
-                    self._send_gcode("MANUAL_STEPPER STEPPER=stepper_0 ENABLE=1 SET_POSITION=0")
-                    self._send_gcode("MANUAL_STEPPER STEPPER=stepper_1 ENABLE=1 SET_POSITION=0")
-                    print("✓ Klipper motors initialized (manual steppers)")
-                    return True
-                else:
-                    print(f"⚠ Klipper state: {state}")
-                    return False
+            # Same connection as the G-code that follows
+            data = self._request("GET", "/printer/info")
+            state = data.get("result", {}).get("state", "")
+            
+            if state == "ready":
+                # For manual steppers, enable them and set starting position
+                self._send_gcode("MANUAL_STEPPER STEPPER=stepper_0 ENABLE=1 SET_POSITION=0\n"
+                                 "MANUAL_STEPPER STEPPER=stepper_1 ENABLE=1 SET_POSITION=0")
+                print("✓ Klipper motors initialized (manual steppers)")
+                return True
+            else:
+                print(f"⚠ Klipper state: {state}")
+                return False
         except Exception as e:
             print(f"✗ Cannot connect to Klipper: {e}")
             return False
@@ -77,12 +223,12 @@ class KlipperMotorController:
             degrees: Target position in degrees
             speed: Speed in degrees/second (converted to mm/s for manual stepper)
         """
-        with self.lock:
+        with self._az_lock:
             # Clamp to limits
             degrees = max(self.azimuth_min, min(self.azimuth_max, degrees))
             
             # Manual stepper command: MANUAL_STEPPER STEPPER=stepper_0 MOVE=degrees SPEED=speed
-            self._send_gcode(f"MANUAL_STEPPER STEPPER=stepper_0 MOVE={degrees} SPEED={speed}")
+            self._queue_gcode(f"MANUAL_STEPPER STEPPER=stepper_0 MOVE={degrees} SPEED={speed}", "azimuth")
             self.azimuth_pos = degrees
     
     def set_altitude(self, degrees: float, speed: float = 3):
@@ -93,7 +239,7 @@ class KlipperMotorController:
             degrees: Target position in degrees
             speed: Speed in degrees/second (default 3 for extremely gentle movement)
         """
-        with self.lock:
+        with self._alt_lock:
             # Clamp to limits (handle inverted range where min > max)
             if self.altitude_min > self.altitude_max:
                 # Inverted: down is positive, up is negative
@@ -103,7 +249,7 @@ class KlipperMotorController:
                 degrees = max(self.altitude_min, min(self.altitude_max, degrees))
             
             # Manual stepper command: MANUAL_STEPPER STEPPER=stepper_1 MOVE=degrees SPEED=speed
-            self._send_gcode(f"MANUAL_STEPPER STEPPER=stepper_1 MOVE={degrees} SPEED={speed}")
+            self._queue_gcode(f"MANUAL_STEPPER STEPPER=stepper_1 MOVE={degrees} SPEED={speed}", "altitude")
             self.altitude_pos = degrees
     
     def move_both(self, azimuth: float, altitude: float, speed: float = 30):
@@ -116,7 +262,20 @@ class KlipperMotorController:
             altitude: Target altitude in degrees
             speed: Speed in degrees/second
         """
-        with self.lock:
+        self._move_both(azimuth, altitude, speed, "both")
+    
+    def queue_move(self, azimuth: float, altitude: float, speed: float = 30):
+        """
+        Queue a move to (azimuth, altitude) behind any earlier queued moves.
+        
+        Unlike move_both, a queued move is never superseded by a later one, so
+        a sequence of positions is driven through in order. Use
+        wait_until_idle() to block until the sequence has finished.
+        """
+        self._move_both(azimuth, altitude, speed, None)
+    
+    def _move_both(self, azimuth: float, altitude: float, speed: float, axis: Optional[str]):
+        with self._az_lock, self._alt_lock:
             # Clamp to limits
             azimuth = max(self.azimuth_min, min(self.azimuth_max, azimuth))
             
@@ -126,25 +285,49 @@ class KlipperMotorController:
             else:
                 altitude = max(self.altitude_min, min(self.altitude_max, altitude))
             
-            # Move both manual steppers (they'll move one after the other)
-            self._send_gcode(f"MANUAL_STEPPER STEPPER=stepper_0 MOVE={azimuth} SPEED={speed}")
-            self._send_gcode(f"MANUAL_STEPPER STEPPER=stepper_1 MOVE={altitude} SPEED={speed}")
+            # Move both manual steppers in one script (they'll move one after
+            # the other, but with a single HTTP round-trip)
+            self._queue_gcode(f"MANUAL_STEPPER STEPPER=stepper_0 MOVE={azimuth} SPEED={speed}\n"
+                              f"MANUAL_STEPPER STEPPER=stepper_1 MOVE={altitude} SPEED={speed}", axis)
             self.azimuth_pos = azimuth
             self.altitude_pos = altitude
     
+    def wait_until_idle(self):
+        """Block until every queued move has been sent and Klipper has finished it."""
+        self.flush()
+        self._send_gcode("M400", timeout=60)
+    
     def get_position(self):
         """Get current position (azimuth, altitude)."""
-        with self.lock:
+        with self._az_lock, self._alt_lock:
             return (self.azimuth_pos, self.altitude_pos)
     
     def stop(self):
         """Stop all motion."""
-        self._send_gcode("M112")  # Emergency stop
+        # Drop pending moves so nothing is sent after the emergency stop
+        self.discard_queued()
+        # Emergency stop on its own short-lived connection: the shared one is
+        # held by the sender thread for as long as a move (or M400) runs
+        conn = http.client.HTTPConnection(self._host, self._port, timeout=2)
+        try:
+            conn.request("POST", self._api_root + "/printer/emergency_stop")
+            conn.getresponse().read()
+        except Exception:
+            # Silently fail like other non-returning commands
+            pass
+        finally:
+            conn.close()
+    
+    def discard_queued(self):
+        """Drop queued commands that have not been sent yet."""
+        while not self._cmd_q.empty():
+            self._discard_oldest()
     
     def disable_motors(self):
-        """Disable motors (free movement)."""
-        self._send_gcode("MANUAL_STEPPER STEPPER=stepper_0 ENABLE=0")
-        self._send_gcode("MANUAL_STEPPER STEPPER=stepper_1 ENABLE=0")
+        """Disable motors (free movement) after any queued moves."""
+        self._queue_gcode("MANUAL_STEPPER STEPPER=stepper_0 ENABLE=0\n"
+                          "MANUAL_STEPPER STEPPER=stepper_1 ENABLE=0")
+        self.flush()
 
 
 class StepperController:
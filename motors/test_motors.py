@@ -6,7 +6,6 @@ Moves the head in a pattern to verify motor control.
 
 import sys
 import time
-sys.path.insert(0, '/home/pi/work/skipper')
 
 from klipper_motors import KlipperMotorController
 
@@ -41,45 +40,20 @@ def main():
     print()
     
     try:
-        # Test 1: Center position
-        print("   Test 1: Return to center (0°, 0°)...")
-        motor.move_both(azimuth=0, altitude=0, speed=20)
-        time.sleep(2)
-        print("   ✓ At center")
-        
-        # Test 2: Look left
-        print("   Test 2: Look left (-20°, 0°)...")
-        motor.set_azimuth(-20, speed=20)
-        time.sleep(2)
-        print("   ✓ Looking left")
-        
-        # Test 3: Look right
-        print("   Test 3: Look right (+20°, 0°)...")
-        motor.set_azimuth(20, speed=20)
-        time.sleep(2)
-        print("   ✓ Looking right")
-        
-        # Test 4: Return to center
-        print("   Test 4: Return to center...")
-        motor.set_azimuth(0, speed=20)
-        time.sleep(2)
-        
-        # Test 5: Look up
-        print("   Test 5: Look up (0°, +15°)...")
-        motor.set_altitude(15, speed=20)
-        time.sleep(2)
-        print("   ✓ Looking up")
-        
-        # Test 6: Look down
-        print("   Test 6: Look down (0°, -15°)...")
-        motor.set_altitude(-15, speed=20)
-        time.sleep(2)
-        print("   ✓ Looking down")
-        
-        # Test 7: Return to center
-        print("   Test 7: Return to center...")
-        motor.move_both(azimuth=0, altitude=0, speed=20)
-        time.sleep(2)
+        # Queue the whole sequence up front and let Klipper run the moves
+        # back to back, then wait once for it to finish
+        sequence = [
+            ("Test 1: Return to center (0°, 0°)", 0, 0, 20),
+            ("Test 2: Look left (-20°, 0°)", -20, 0, 20),
+            ("Test 3: Look right (+20°, 0°)", 20, 0, 20),
+            ("Test 4: Return to center", 0, 0, 20),
+            ("Test 5: Look up (0°, +15°)", 0, 15, 20),
+            ("Test 6: Look down (0°, -15°)", 0, -15, 20),
+            ("Test 7: Return to center", 0, 0, 20),
+        ]
+        for label, az, alt, speed in sequence:
+            print(f"   {label}...")
+            motor.queue_move(azimuth=az, altitude=alt, speed=speed)
         
         # Test 8: Circle pattern
         print("   Test 8: Circle pattern...")
@@ -93,16 +67,16 @@ def main():
         
         for i, (az, alt) in enumerate(positions, 1):
             print(f"      Position {i}/5: ({az:+3d}°, {alt:+3d}°)")
-            motor.move_both(azimuth=az, altitude=alt, speed=25)
-            time.sleep(1.5)
-        
-        print("   ✓ Circle complete")
+            motor.queue_move(azimuth=az, altitude=alt, speed=25)
         
         # Final: Return to center
         print()
         print("4. Returning to center position...")
-        motor.move_both(azimuth=0, altitude=0, speed=20)
-        time.sleep(2)
+        motor.queue_move(azimuth=0, altitude=0, speed=20)
+        
+        print("   Waiting for the queued moves to finish...")
+        motor.wait_until_idle()
+        print("   ✓ Sequence complete")
         
         print()
         print("=" * 60)
@@ -124,8 +98,9 @@ def main():
         print()
         print("Test interrupted by user")
         print("Returning to center...")
-        motor.move_both(azimuth=0, altitude=0, speed=20)
-        time.sleep(2)
+        motor.discard_queued()
+        motor.queue_move(azimuth=0, altitude=0, speed=20)
+        motor.wait_until_idle()
         motor.disable_motors()
         return 0
         
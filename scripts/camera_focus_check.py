@@ -5,6 +5,8 @@ Check camera focus capabilities and enable autofocus if available
 
 import cv2
 import subprocess
+from contextlib import contextmanager
+from pathlib import Path
 
 def check_v4l2_controls(device=0):
     """Check available V4L2 controls for the camera"""
@@ -44,24 +46,31 @@ def check_v4l2_controls(device=0):
         print(f"Error: {e}")
         return None
 
-def test_opencv_focus(device=0):
-    """Test OpenCV focus capabilities"""
+@contextmanager
+def open_camera(device=0):
+    """Open the camera once for all OpenCV focus probes"""
+    cap = cv2.VideoCapture(device, cv2.CAP_V4L2)
+    try:
+        yield cap
+    finally:
+        cap.release()
+
+def test_opencv_focus(cap, device=0):
+    """Test OpenCV focus capabilities; returns True if autofocus was enabled"""
     print(f"\nTesting OpenCV focus controls for camera {device}...")
     print("=" * 60)
     
-    cap = cv2.VideoCapture(device, cv2.CAP_V4L2)
-    
     if not cap.isOpened():
         print(f"❌ Cannot open camera {device}")
-        return
+        return False
     
     # Check autofocus support
     autofocus = cap.get(cv2.CAP_PROP_AUTOFOCUS)
     print(f"Autofocus status: {autofocus}")
     
     # Try to enable autofocus
-    success = cap.set(cv2.CAP_PROP_AUTOFOCUS, 1)
-    if success:
+    enabled = cap.set(cv2.CAP_PROP_AUTOFOCUS, 1)
+    if enabled:
         print("✓ Autofocus enabled")
         new_status = cap.get(cv2.CAP_PROP_AUTOFOCUS)
         print(f"  New autofocus status: {new_status}")
@@ -80,7 +89,7 @@ def test_opencv_focus(device=0):
     else:
         print("❌ Cannot set manual focus (autofocus may be active or not supported)")
     
-    cap.release()
+    return enabled
 
 def enable_autofocus_v4l2(device=0):
     """Enable autofocus using v4l2-ctl"""
@@ -88,9 +97,10 @@ def enable_autofocus_v4l2(device=0):
     print("=" * 60)
     
     try:
-        # Try to set focus_auto=1
+        # Set focus_auto=1 and read it back in a single v4l2-ctl call
         result = subprocess.run(
-            ['v4l2-ctl', '-d', f'/dev/video{device}', '-c', 'focus_auto=1'],
+            ['v4l2-ctl', '-d', f'/dev/video{device}',
+             '--set-ctrl', 'focus_auto=1', '--get-ctrl', 'focus_auto'],
             capture_output=True,
             text=True,
             timeout=5
@@ -98,14 +108,6 @@ def enable_autofocus_v4l2(device=0):
         
         if result.returncode == 0:
             print("✓ Autofocus enabled via v4l2-ctl")
-            
-            # Verify it worked
-            result = subprocess.run(
-                ['v4l2-ctl', '-d', f'/dev/video{device}', '-C', 'focus_auto'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
             print(f"Current setting: {result.stdout.strip()}")
         else:
             print(f"❌ Failed: {result.stderr}")
@@ -120,14 +122,15 @@ def main():
     print("=" * 60)
     
     # Check which cameras are available
+    # List the device nodes instead of opening each one (opening negotiates
+    # formats and allocates buffers); only the tested device is opened below
     print("\nDetecting cameras...")
-    for i in range(4):
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            print(f"  Camera {i}: Found")
-            cap.release()
-        else:
-            break
+    devices = sorted(Path('/dev').glob('video*'),
+                     key=lambda p: int(p.name[5:]) if p.name[5:].isdigit() else -1)
+    for dev in devices:
+        print(f"  {dev}: Found")
+    if not devices:
+        print("  No /dev/video* devices found")
     
     device = 0
     print(f"\nChecking camera {device}...\n")
@@ -135,11 +138,13 @@ def main():
     # V4L2 controls
     check_v4l2_controls(device)
     
-    # OpenCV controls
-    test_opencv_focus(device)
+    # OpenCV controls (one open for all probes)
+    with open_camera(device) as cap:
+        autofocus_enabled = test_opencv_focus(cap, device)
     
-    # Try to enable autofocus
-    enable_autofocus_v4l2(device)
+    # Fall back to v4l2-ctl only if OpenCV could not enable autofocus
+    if not autofocus_enabled:
+        enable_autofocus_v4l2(device)
     
     print("\n" + "=" * 60)
     print("Recommendations:")
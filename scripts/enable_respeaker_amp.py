@@ -4,8 +4,8 @@ ReSpeaker 2-Mic HAT Amplifier Enable
 Some versions require GPIO 12 to be HIGH to enable the speaker amplifier
 """
 
+import signal
 import sys
-import time
 
 try:
     import RPi.GPIO as GPIO
@@ -23,6 +23,15 @@ else:
 
 AMP_ENABLE_PIN = 12  # BCM pin 12
 
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def wait_for_exit():
+    """Sleep in the kernel until Ctrl+C or SIGTERM (both raise KeyboardInterrupt)"""
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    while True:
+        signal.pause()
+
 def enable_amp_gpio():
     """Enable amplifier using RPi.GPIO"""
     GPIO.setmode(GPIO.BCM)
@@ -33,6 +42,28 @@ def enable_amp_gpio():
 
 def enable_amp_gpiod():
     """Enable amplifier using gpiod"""
+    if not hasattr(gpiod, 'request_lines'):
+        return enable_amp_gpiod_v1()
+    
+    # libgpiod v2: the line is driven for as long as the request fd is open
+    from gpiod.line import Direction, Value
+    request = gpiod.request_lines(
+        '/dev/gpiochip4',  # Pi 5 uses gpiochip4
+        consumer="respeaker",
+        config={AMP_ENABLE_PIN: gpiod.LineSettings(direction=Direction.OUTPUT,
+                                                   output_value=Value.ACTIVE)},
+    )
+    print(f"✓ Enabled amplifier on GPIO {AMP_ENABLE_PIN} (gpiod)")
+    print("\nAmplifier enabled. Press Ctrl+C to disable and exit.")
+    try:
+        wait_for_exit()
+    except KeyboardInterrupt:
+        request.set_value(AMP_ENABLE_PIN, Value.INACTIVE)
+        request.release()
+        print("\n✓ Amplifier disabled")
+
+def enable_amp_gpiod_v1():
+    """Enable amplifier using the libgpiod v1 bindings"""
     chip = gpiod.Chip('gpiochip4')  # Pi 5 uses gpiochip4
     line = chip.get_line(AMP_ENABLE_PIN)
     line.request(consumer="respeaker", type=gpiod.LINE_REQ_DIR_OUT)
@@ -41,8 +72,7 @@ def enable_amp_gpiod():
     # Keep the script running to maintain GPIO state
     print("\nAmplifier enabled. Press Ctrl+C to disable and exit.")
     try:
-        while True:
-            time.sleep(1)
+        wait_for_exit()
     except KeyboardInterrupt:
         line.set_value(0)
         print("\n✓ Amplifier disabled")
@@ -61,8 +91,7 @@ def main():
             print("\nAmplifier enabled. Now try playing audio.")
             print("This script will keep running. Press Ctrl+C to exit.")
             try:
-                while True:
-                    time.sleep(1)
+                wait_for_exit()
             except KeyboardInterrupt:
                 GPIO.output(AMP_ENABLE_PIN, GPIO.LOW)
                 GPIO.cleanup()
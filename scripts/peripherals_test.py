@@ -20,20 +20,30 @@ Usage:
 
 import time
 import argparse
+import signal
 import sys
+import threading
 
-# Try to import RPi.GPIO, fallback to dummy if not available
+# Prefer lgpio (kernel GPIO chardev, works on Pi 5), then RPi.GPIO,
+# fallback to dummy if neither is available
 try:
-    import RPi.GPIO as GPIO
-    HW_GPIO = True
-except Exception:
-    HW_GPIO = False
+    import lgpio
+    GPIO_BACKEND = 'lgpio'
+except ImportError:
+    try:
+        import RPi.GPIO as GPIO
+        GPIO_BACKEND = 'RPi.GPIO'
+    except Exception:
+        GPIO_BACKEND = None
+HW_GPIO = GPIO_BACKEND is not None
 
 # Import smbus for direct I2C access
 try:
     import smbus2 as smbus
+    from smbus2 import i2c_msg
 except ImportError:
     import smbus
+    i2c_msg = None
 
 
 # GPIO pin mapping
@@ -42,51 +52,100 @@ PIN_G = 22
 PIN_B = 27
 PIN_FAN = 17
 
+# Pins are driven as groups, so each LED update is a single GPIO call
+_LED_PINS = (PIN_R, PIN_G, PIN_B)
+_ALL_PINS = _LED_PINS + (PIN_FAN,)
+
+# lgpio chip handle (Pi 5 header is gpiochip4 on older kernels, else gpiochip0)
+_chip = None
+
+# Last level written to each output pin, so unchanged writes are skipped
+_pin_levels = {}
+
+# Default fan turn-off point below the turn-on threshold (°C)
+FAN_HYSTERESIS = 2.0
+
+
+def _open_chip():
+    for chip in (4, 0):
+        try:
+            return lgpio.gpiochip_open(chip)
+        except lgpio.error:
+            continue
+    raise RuntimeError("No GPIO chip found")
+
+
+def _write_pins(pins, levels):
+    """Drive several output pins at once on whichever backend is active
+
+    Returns False without touching the hardware if every pin is already at
+    the requested level.
+    """
+    levels = tuple(bool(level) for level in levels)
+    if all(_pin_levels.get(pin) == level for pin, level in zip(pins, levels)):
+        return False
+    if GPIO_BACKEND == 'lgpio':
+        bits = sum(1 << i for i, level in enumerate(levels) if level)
+        lgpio.group_write(_chip, pins[0], bits)
+    else:
+        GPIO.output(list(pins), tuple(GPIO.HIGH if level else GPIO.LOW for level in levels))
+    _pin_levels.update(zip(pins, levels))
+    return True
+
 
 def setup_gpio():
+    global _chip
     if not HW_GPIO:
-        print("RPi.GPIO not available. GPIO functions will be simulated.")
+        print("No GPIO library available. GPIO functions will be simulated.")
         return
-    GPIO.setmode(GPIO.BCM)
-    GPIO.setup(PIN_R, GPIO.OUT, initial=GPIO.LOW)
-    GPIO.setup(PIN_G, GPIO.OUT, initial=GPIO.LOW)
-    GPIO.setup(PIN_B, GPIO.OUT, initial=GPIO.LOW)
-    GPIO.setup(PIN_FAN, GPIO.OUT, initial=GPIO.LOW)
+    if GPIO_BACKEND == 'lgpio':
+        _chip = _open_chip()
+        lgpio.group_claim_output(_chip, list(_LED_PINS), [0] * len(_LED_PINS))
+        lgpio.group_claim_output(_chip, [PIN_FAN], [0])
+    else:
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(list(_ALL_PINS), GPIO.OUT, initial=GPIO.LOW)
+    _pin_levels.update(dict.fromkeys(_ALL_PINS, False))
 
 
 def cleanup_gpio():
+    global _chip
     if not HW_GPIO:
         return
-    GPIO.output(PIN_R, GPIO.LOW)
-    GPIO.output(PIN_G, GPIO.LOW)
-    GPIO.output(PIN_B, GPIO.LOW)
-    GPIO.output(PIN_FAN, GPIO.LOW)
-    GPIO.cleanup()
+    if GPIO_BACKEND == 'lgpio':
+        if _chip is None:
+            return
+        _write_pins(_LED_PINS, (0, 0, 0))
+        _write_pins((PIN_FAN,), (0,))
+        lgpio.gpiochip_close(_chip)
+        _chip = None
+    else:
+        GPIO.output(list(_ALL_PINS), GPIO.LOW)
+        GPIO.cleanup()
+    _pin_levels.clear()
 
 
 def set_led(r=False, g=False, b=False):
     if not HW_GPIO:
         print(f"[SIM] LED -> R={r} G={g} B={b}")
         return
-    GPIO.output(PIN_R, GPIO.HIGH if r else GPIO.LOW)
-    GPIO.output(PIN_G, GPIO.HIGH if g else GPIO.LOW)
-    GPIO.output(PIN_B, GPIO.HIGH if b else GPIO.LOW)
+    _write_pins(_LED_PINS, (r, g, b))
 
 
 def fan_on():
     if not HW_GPIO:
         print("[SIM] Fan ON")
         return
-    print("🌀 Fan ON (GPIO17 HIGH)")
-    GPIO.output(PIN_FAN, GPIO.HIGH)
+    if _write_pins((PIN_FAN,), (1,)):
+        print("🌀 Fan ON (GPIO17 HIGH)")
 
 
 def fan_off():
     if not HW_GPIO:
         print("[SIM] Fan OFF")
         return
-    print("🛑 Fan OFF (GPIO17 LOW)")
-    GPIO.output(PIN_FAN, GPIO.LOW)
+    if _write_pins((PIN_FAN,), (0,)):
+        print("🛑 Fan OFF (GPIO17 LOW)")
 
 
 def led_test(cycle_delay=0.8, cycles=3):
@@ -115,17 +174,66 @@ def led_test(cycle_delay=0.8, cycles=3):
         print("LED test complete")
 
 
-def read_sht3x_once(bus_num=1, address=0x44):
+# Open I2C buses, kept for the life of the process so polling does not
+# reopen the device node on every sample
+_buses = {}
+
+
+def _get_bus(bus_num):
+    bus = _buses.get(bus_num)
+    if bus is None:
+        bus = _buses[bus_num] = smbus.SMBus(bus_num)
+    return bus
+
+
+def _make_crc8_table(poly=0x31):
+    table = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly if crc & 0x80 else crc << 1) & 0xFF
+        table[i] = crc
+    return bytes(table)
+
+
+# SHT3x single-shot commands (0x2C, clock stretching): repeatability ->
+# (command LSB, max conversion time in s). Medium is plenty for fan control
+SHT3X_REPEATABILITY = {
+    'high': (0x06, 0.015),
+    'medium': (0x0D, 0.006),
+    'low': (0x10, 0.004),
+}
+
+# SHT3x CRC-8 (poly 0x31, init 0xFF) lookup table
+_CRC8 = _make_crc8_table()
+
+
+def _sht3x_crc_ok(data, i):
+    """Check the CRC byte following the 16-bit word at data[i:i + 2]"""
+    return _CRC8[_CRC8[0xFF ^ data[i]] ^ data[i + 1]] == data[i + 2]
+
+
+def read_sht3x_once(bus_num=1, address=0x44, verbose=True, repeatability='high'):
     """Read SHT3x directly (not via multiplexer)"""
     try:
-        bus = smbus.SMBus(bus_num)
+        bus = _get_bus(bus_num)
+        cmd_lsb, conversion_time = SHT3X_REPEATABILITY[repeatability]
         
-        # Send measurement command (high repeatability)
-        bus.write_i2c_block_data(address, 0x2C, [0x06])
-        time.sleep(0.015)  # Wait for measurement
+        if i2c_msg is not None:
+            # Send measurement command, wait for the conversion, then a
+            # plain 6-byte read (temp + humidity with CRC)
+            bus.i2c_rdwr(i2c_msg.write(address, [0x2C, cmd_lsb]))
+            time.sleep(conversion_time)
+            read = i2c_msg.read(address, 6)
+            bus.i2c_rdwr(read)
+            data = list(read)
+        else:
+            bus.write_i2c_block_data(address, 0x2C, [cmd_lsb])
+            time.sleep(conversion_time)  # Wait for measurement
+            data = bus.read_i2c_block_data(address, 0x00, 6)
         
-        # Read 6 bytes (temp + humidity with CRC)
-        data = bus.read_i2c_block_data(address, 0x00, 6)
+        if not (_sht3x_crc_ok(data, 0) and _sht3x_crc_ok(data, 3)):
+            raise IOError(f"CRC mismatch in SHT3x readout {bytes(data).hex()}")
         
         # Convert temperature
         temp_raw = data[0] * 256 + data[1]
@@ -135,37 +243,86 @@ def read_sht3x_once(bus_num=1, address=0x44):
         hum_raw = data[3] * 256 + data[4]
         humidity = 100 * hum_raw / 65535.0
         
-        print(f"📊 SHT3x (direct at 0x{address:02x}) -> Temperature: {temperature:.2f} °C, Humidity: {humidity:.2f} %")
+        if verbose:
+            print(f"📊 SHT3x (direct at 0x{address:02x}) -> Temperature: {temperature:.2f} °C, Humidity: {humidity:.2f} %")
         return temperature, humidity
     except Exception as e:
-        print(f"❌ Error reading SHT3x: {e}")
+        if verbose:
+            print(f"❌ Error reading SHT3x: {e}")
+        return None
+
+
+# Latest SHT3x reading, refreshed by the background poller so consumers never
+# wait on the I2C transfer themselves
+_latest = {"temp": None, "hum": None, "ts": 0.0}
+_latest_lock = threading.Lock()
+
+
+def _sensor_poller(stop, first_read, interval=1.0, repeatability='medium'):
+    failing = False
+    while not stop.is_set():
+        res = read_sht3x_once(verbose=False, repeatability=repeatability)
+        # Report only when the sensor stops or starts answering, so a
+        # disconnected sensor doesn't print once per poll
+        if (res is None) != failing:
+            failing = res is None
+            print("❌ SHT3x not responding" if failing else "✓ SHT3x responding again")
+        if res is not None:
+            with _latest_lock:
+                _latest.update(temp=res[0], hum=res[1], ts=time.monotonic())
+        first_read.set()
+        stop.wait(interval)
+
+
+def latest_reading(max_age=10.0):
+    """Return the cached (temperature, humidity), or None if missing or stale"""
+    with _latest_lock:
+        snap = dict(_latest)
+    if snap["temp"] is None or time.monotonic() - snap["ts"] > max_age:
         return None
+    return snap["temp"], snap["hum"]
 
 
-def auto_fan_monitor(threshold=30.0, poll_interval=5.0):
-    print(f"Starting auto fan monitor (threshold={threshold}°C)...")
+def auto_fan_monitor(threshold=30.0, poll_interval=5.0, hysteresis=FAN_HYSTERESIS,
+                     repeatability='medium'):
+    """Run the fan above threshold until it cools below threshold - hysteresis"""
+    print(f"Starting auto fan monitor (threshold={threshold}°C, off below {threshold - hysteresis}°C)...")
     print(f"Fan control pin: GPIO{PIN_FAN}")
     setup_gpio()
+    # Wait on an event rather than sleeping so SIGTERM (service stop) ends the
+    # loop immediately and still runs the GPIO cleanup below
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    first_read = threading.Event()
+    poller = threading.Thread(target=_sensor_poller, args=(stop, first_read),
+                              kwargs={'repeatability': repeatability}, daemon=True)
+    poller.start()
+    first_read.wait(1.0)
     try:
-        while True:
-            res = read_sht3x_once()
+        while not stop.is_set():
+            res = latest_reading(max_age=max(10.0, 2 * poll_interval))
             if res is None:
                 print("Sensor read failed; keeping fan off")
                 fan_off()
             else:
                 temp, hum = res
                 if temp >= threshold:
-                    print(f"🔥 Temp {temp:.2f}°C >= {threshold}°C -> Activating fan")
+                    print(f"🔥 Temp {temp:.2f}°C >= {threshold}°C -> Fan on")
                     fan_on()
                     set_led(True, False, False)  # Red when hot
-                else:
-                    print(f"✅ Temp {temp:.2f}°C < {threshold}°C -> Fan stays off")
+                elif temp < threshold - hysteresis:
+                    print(f"✅ Temp {temp:.2f}°C < {threshold - hysteresis}°C -> Fan off")
                     fan_off()
                     set_led(False, True, False)  # Green when ok
-            time.sleep(poll_interval)
+                else:
+                    # Inside the dead band: leave the fan as it is
+                    print(f"〰 Temp {temp:.2f}°C within hysteresis band -> No change")
+            stop.wait(poll_interval)
     except KeyboardInterrupt:
         print("\nStopping auto fan monitor")
     finally:
+        stop.set()
+        poller.join(timeout=1.0)
         cleanup_gpio()
 
 
@@ -198,6 +355,11 @@ if __name__ == '__main__':
     parser.add_argument('--read-sensor', action='store_true', help='Read SHT3x once')
     parser.add_argument('--auto-fan', action='store_true', help='Run auto fan monitor')
     parser.add_argument('--threshold', type=float, default=30.0, help='Temperature threshold for fan (°C)')
+    parser.add_argument('--hysteresis', type=float, default=FAN_HYSTERESIS,
+                        help='Fan turns off this many °C below the threshold')
+    parser.add_argument('--repeatability', choices=sorted(SHT3X_REPEATABILITY),
+                        help='SHT3x measurement repeatability '
+                             '(default: high for --read-sensor, medium for --auto-fan)')
     parser.add_argument('--bus', type=int, default=1, help='I2C bus number')
     parser.add_argument('--address', type=lambda x: int(x, 0), default=0x44, help='SHT3x address')
     args = parser.parse_args()
@@ -211,11 +373,13 @@ if __name__ == '__main__':
         sys.exit(0)
 
     if args.read_sensor:
-        read_sht3x_once(bus_num=args.bus, address=args.address)
+        read_sht3x_once(bus_num=args.bus, address=args.address,
+                        repeatability=args.repeatability or 'high')
         sys.exit(0)
 
     if args.auto_fan:
-        auto_fan_monitor(threshold=args.threshold)
+        auto_fan_monitor(threshold=args.threshold, hysteresis=args.hysteresis,
+                         repeatability=args.repeatability or 'medium')
         sys.exit(0)
 
     parser.print_help()
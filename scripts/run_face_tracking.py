@@ -9,43 +9,36 @@ Key changes from original:
 - Simplified motor interface
 """
 
-# Import everything from original except motor control
 import sys
-import os
 
-# Add klipper_motors to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Patch the motor control before importing follow_face
-from klipper_motors import get_motor_controller
-
-# Now we need to modify how the original code works
-# Instead of patching the entire file, let's create a wrapper
-
-print("=" * 60)
-print("SKIPPER - Face Tracking with Klipper/Octopus")
-print("=" * 60)
-
-# Initialize Klipper motors
-motor = get_motor_controller()
-if not motor.initialize():
-    print("✗ Failed to initialize Klipper. Is Klipper running?")
-    print("  Check: curl http://localhost:7125/printer/info")
-    sys.exit(1)
-
-print("✓ Klipper motors initialized")
-print("✓ Ready for face tracking")
-print()
-
-# Import modified tracking logic
-print("Starting face tracking with Klipper control...")
-print("Use Ctrl+C to stop")
-print()
-
-# The actual tracking code will go in follow_face_klipper.py
-# For now, let's create a simple test
-
-if __name__ == "__main__":
+def main():
+    # Needs the project installed (pip3 install -e .) so motors is importable;
+    # imported here so importing this module does not touch Klipper
+    from motors.klipper_motors import get_motor_controller
+    
+    print("=" * 60)
+    print("SKIPPER - Face Tracking with Klipper/Octopus")
+    print("=" * 60)
+    
+    # Initialize Klipper motors
+    motor = get_motor_controller()
+    if not motor.initialize():
+        print("✗ Failed to initialize Klipper. Is Klipper running?")
+        print("  Check: curl http://localhost:7125/printer/info")
+        return 1
+    
+    print("✓ Klipper motors initialized")
+    print("✓ Ready for face tracking")
+    print()
+    
+    # Import modified tracking logic
+    print("Starting face tracking with Klipper control...")
+    print("Use Ctrl+C to stop")
+    print()
+    
+    # The actual tracking code will go in follow_face_klipper.py
+    # For now, let's create a simple test
     print("To integrate with existing face tracking:")
     print("1. Import klipper_motors in your follow_face.py")
     print("2. Replace StepperWorker with Klipper motor control")
@@ -53,21 +46,18 @@ if __name__ == "__main__":
     print()
     print("Testing motor control...")
     
-    import time
-    
     try:
+        # Two-axis moves (one script per position), queued back to back
         print("Moving azimuth to 10°...")
-        motor.set_azimuth(10, speed=20)
-        time.sleep(2)
+        motor.queue_move(10, 0, speed=20)
         
         print("Moving altitude to 5°...")
-        motor.set_altitude(5, speed=20)
-        time.sleep(2)
+        motor.queue_move(10, 5, speed=20)
         
         print("Moving both to center...")
-        motor.move_both(0, 0, speed=20)
-        time.sleep(2)
+        motor.queue_move(0, 0, speed=20)
         
+        motor.wait_until_idle()
         print("✓ Motor test complete!")
         
     except KeyboardInterrupt:
@@ -75,3 +65,8 @@ if __name__ == "__main__":
     finally:
         motor.disable_motors()
         print("Motors disabled")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
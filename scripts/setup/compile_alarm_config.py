@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Compile alarm_config.yaml into an importable Python module
+
+Writes alarms/_alarm_config_compiled.py containing the parsed config as a
+Python literal. AlarmManager imports it instead of parsing YAML at boot, and
+falls back to YAML whenever the source file no longer matches.
+
+Usage:
+    python3 scripts/setup/compile_alarm_config.py
+"""
+
+import hashlib
+import pprint
+import sys
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CONFIG_PATH = PROJECT_ROOT / "alarms" / "alarm_config.yaml"
+OUTPUT_PATH = PROJECT_ROOT / "alarms" / "_alarm_config_compiled.py"
+
+
+def main():
+    raw = CONFIG_PATH.read_bytes()
+    config = yaml.safe_load(raw) or {}
+
+    OUTPUT_PATH.write_text(
+        "# Generated by scripts/setup/compile_alarm_config.py - do not edit\n"
+        f"# Source: {CONFIG_PATH.name}\n\n"
+        f"SOURCE_SHA1 = {hashlib.sha1(raw).hexdigest()!r}\n\n"
+        f"ALARM_CONFIG = {pprint.pformat(config, sort_dicts=False)}\n"
+    )
+
+    print(f"✓ Compiled {CONFIG_PATH} → {OUTPUT_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -71,26 +71,30 @@ def main():
         print("\n❌ Error: Both --name and --images are required for enrollment")
         sys.exit(1)
     
-    # Expand wildcards and collect all image paths
-    image_paths = []
-    for pattern in args.images:
-        expanded = glob.glob(pattern)
-        image_paths.extend(expanded)
+    # Expand wildcards lazily so large photo folders are never held as a list
+    found = 0
     
-    if not image_paths:
-        print(f"❌ No images found matching: {args.images}")
-        sys.exit(1)
+    def image_paths():
+        nonlocal found
+        for pattern in args.images:
+            for path in glob.iglob(pattern):
+                found += 1
+                yield path
     
-    print(f"\nEnrolling '{args.name}' from {len(image_paths)} images...")
+    print(f"\nEnrolling '{args.name}'...")
     print(f"Threshold: {args.threshold} (for testing)")
     print("-" * 60)
     
     # Enroll all images
-    count = manager.add_person_from_images(args.name, image_paths)
+    count = manager.add_person_from_images_batched(args.name, image_paths())
+    
+    if not found:
+        print(f"❌ No images found matching: {args.images}")
+        sys.exit(1)
     
     print("-" * 60)
     if count > 0:
-        print(f"✅ SUCCESS: Enrolled {count}/{len(image_paths)} images for '{args.name}'")
+        print(f"✅ SUCCESS: Enrolled {count}/{found} images for '{args.name}'")
         print(f"\nDatabase: {manager.db_path}")
         print(f"\nRecommendations:")
         print(f"  - {count} embeddings is {'good' if count >= 5 else 'minimal'}")
@@ -13,25 +13,45 @@ Then open: http://optimus:5001
 """
 
 import argparse
+import io
 import time
 import sys
 import os
 from pathlib import Path
-from picamera2 import Picamera2
-import cv2
 import threading
 from flask import Flask, Response, render_template_string
+from werkzeug.serving import WSGIRequestHandler, make_server
 
 # Flask app
 app = Flask(__name__)
 
+# Multipart framing around each streamed JPEG; joined in one allocation
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+MJPEG_PART_TRAILER = b'\r\n'
+
 # Global state
-current_frame = None
 current_instruction = "Initializing..."
 photo_count = 0
 total_photos = 0
-frame_lock = threading.Lock()
-capture_mode = False
+# Set by /start_capture; the capture thread blocks on it
+capture_mode = threading.Event()
+
+
+class StreamingOutput(io.BufferedIOBase):
+    """Holds the latest JPEG from the camera's MJPEG encoder"""
+    def __init__(self):
+        self.frame = None
+        self.condition = threading.Condition()
+
+    def write(self, buf):
+        with self.condition:
+            self.frame = buf
+            self.condition.notify_all()
+
+
+# Preview frames arrive already JPEG-encoded, once per camera frame, and are
+# shared by every connected browser
+stream_output = StreamingOutput()
 
 # HTML template
 HTML_TEMPLATE = """
@@ -262,22 +282,12 @@ HTML_TEMPLATE = """
 
 def generate_frames():
     """Generator for streaming frames"""
-    global current_frame, frame_lock
-    
     while True:
-        with frame_lock:
-            if current_frame is None:
-                time.sleep(0.1)
-                continue
-            frame = current_frame.copy()
-        
-        # Encode frame as JPEG
-        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-        frame_bytes = buffer.tobytes()
+        with stream_output.condition:
+            stream_output.condition.wait()
+            frame_bytes = stream_output.frame
         
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-        time.sleep(0.033)  # ~30 fps
+        yield b''.join((MJPEG_PART_HEADER, frame_bytes, MJPEG_PART_TRAILER))
 
 @app.route('/')
 def index():
@@ -296,27 +306,47 @@ def status():
         'instruction': current_instruction,
         'photo_count': photo_count,
         'total_photos': total_photos,
-        'capture_mode': capture_mode
+        'capture_mode': capture_mode.is_set()
     }
 
 @app.route('/start_capture', methods=['POST'])
 def start_capture():
-    global capture_mode
-    capture_mode = True
+    capture_mode.set()
     return {'success': True}
 
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """HTTP/1.1 handler: the page's 500ms /status polls reuse one connection
+    (and one server thread) instead of opening a new one each time"""
+    protocol_version = "HTTP/1.1"
+
+    def log_request(self, code='-', size='-'):
+        # Skip the access log line for the status polling only
+        if self.path.startswith('/status'):
+            return
+        super().log_request(code, size)
+
 def capture_thread(name, output_dir):
     """Background thread for capturing photos"""
-    global current_frame, current_instruction, photo_count, total_photos, frame_lock, capture_mode
+    global current_instruction, photo_count, total_photos
+    
+    # Imported here so --help and module import don't load libcamera
+    from picamera2 import Picamera2
+    from picamera2.encoders import MJPEGEncoder
+    from picamera2.outputs import FileOutput
     
-    # Initialize camera
+    # Initialize camera: full-size main stream for the saved photos, and a
+    # lores stream that the MJPEG encoder turns into the browser preview.
+    # BGR888 is laid out R,G,B in memory, which is what the JPEG writer
+    # behind capture_file wants, so saving needs no channel swap
     current_instruction = "Initializing camera..."
     picam2 = Picamera2()
-    config = picam2.create_preview_configuration(
-        main={"size": (1536, 864), "format": "RGB888"}
+    config = picam2.create_video_configuration(
+        main={"size": (1536, 864), "format": "BGR888"},
+        lores={"size": (768, 432)}
     )
     picam2.configure(config)
-    picam2.start()
+    picam2.options["quality"] = 95
+    picam2.start_recording(MJPEGEncoder(), FileOutput(stream_output), name="lores")
     time.sleep(2)
     
     current_instruction = "Ready! Click 'Start Enrollment' button"
@@ -337,22 +367,8 @@ def capture_thread(name, output_dir):
     
     total_photos = sum(num for _, num in instructions)
     
-    # Update preview continuously
-    def preview_loop():
-        global current_frame, frame_lock
-        while True:
-            frame = picam2.capture_array()
-            frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            with frame_lock:
-                current_frame = frame_bgr
-            time.sleep(0.033)
-    
-    preview_thread = threading.Thread(target=preview_loop, daemon=True)
-    preview_thread.start()
-    
     # Wait for start signal
-    while not capture_mode:
-        time.sleep(0.1)
+    capture_mode.wait()
     
     # Start capturing
     for instruction_text, num_photos in instructions:
@@ -367,15 +383,12 @@ def capture_thread(name, output_dir):
         for i in range(num_photos):
             current_instruction = f"CAPTURING: {instruction_text}"
             
-            frame = picam2.capture_array()
-            frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            
-            # Save photo
+            # Save photo straight from the main stream
             timestamp = int(time.time() * 1000)
             filename = f"{name}_{timestamp}_{photo_count:03d}.jpg"
             filepath = output_dir / filename
             
-            cv2.imwrite(str(filepath), frame_bgr, [cv2.IMWRITE_JPEG_QUALITY, 95])
+            picam2.capture_file(str(filepath), name="main")
             photo_count += 1
             
             print(f"✓ Captured: {filename}")
@@ -383,7 +396,7 @@ def capture_thread(name, output_dir):
             if i < num_photos - 1:
                 time.sleep(0.5)
     
-    picam2.stop()
+    picam2.stop_recording()
     current_instruction = f"✅ COMPLETE! Captured {photo_count} photos. Close this page."
 
 def main():
@@ -416,7 +429,14 @@ def main():
     capture.start()
     
     # Start web server
-    app.run(host='0.0.0.0', port=args.port, debug=False, threaded=True)
+    server = make_server('0.0.0.0', args.port, app, threaded=True,
+                         request_handler=KeepAliveRequestHandler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
 if __name__ == "__main__":
     main()
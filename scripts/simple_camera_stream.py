@@ -14,6 +14,10 @@ from picamera2.outputs import FileOutput
 
 app = Flask(__name__)
 
+# Multipart framing around each streamed JPEG; joined in one allocation
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+MJPEG_PART_TRAILER = b'\r\n'
+
 # Global frame storage
 latest_frame = None
 frame_lock = threading.Lock()
@@ -34,8 +38,7 @@ def generate_frames(output):
         with output.condition:
             output.condition.wait()
             frame = output.frame
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+        yield b''.join((MJPEG_PART_HEADER, frame, MJPEG_PART_TRAILER))
 
 @app.route('/')
 def index():
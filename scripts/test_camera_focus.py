@@ -21,6 +21,8 @@ def capture_test_image(device=0, output_dir="."):
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
     cap.set(cv2.CAP_PROP_FPS, 30)
+    # Keep only one queued V4L2 buffer so the captured frame is current
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
     
     # Get actual resolution
     actual_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -30,11 +32,12 @@ def capture_test_image(device=0, output_dir="."):
     # Let camera adjust
     print("Warming up camera (2 seconds)...")
     for i in range(10):
-        ret, frame = cap.read()
+        cap.grab()  # dequeue without decoding
         time.sleep(0.2)
     
-    # Capture frame
+    # Capture frame: drop whatever queued up during the last sleep first
     print("Capturing image...")
+    cap.grab()
     ret, frame = cap.read()
     
     if not ret:
@@ -6,13 +6,17 @@ Runs diagnostics on boot and displays status via RGB LED
 Uses alarm configuration from alarms/alarm_config.yaml
 """
 
+import os
 import signal
 import sys
 import time
+import threading
 import subprocess
-import socket
+import http.client
+import json
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -191,6 +195,41 @@ def check_wifi():
         logger.error(diagnostics['wifi']['message'])
         return False
 
+def _query_moonraker(host, port, timeout):
+    """
+    Query Moonraker with one JSON-RPC batch request
+    
+    Returns a dict of results keyed by method name (empty if the endpoint
+    answered but could not be parsed). Raises OSError if Moonraker is not
+    reachable.
+    """
+    methods = ['printer.info', 'server.info']
+    payload = json.dumps([
+        {'jsonrpc': '2.0', 'method': method, 'id': i}
+        for i, method in enumerate(methods)
+    ])
+    
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request('POST', '/server/jsonrpc', body=payload,
+                     headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        body = response.read()
+    finally:
+        conn.close()
+    
+    try:
+        replies = json.loads(body)
+    except ValueError:
+        return {}
+    if not isinstance(replies, list):
+        return {}
+    return {
+        methods[reply['id']]: reply.get('result', {})
+        for reply in replies
+        if isinstance(reply, dict) and reply.get('id') in range(len(methods))
+    }
+
 def check_klipper():
     """Check if Klipper is accessible"""
     if not alarm_manager.is_diagnostic_enabled('klipper'):
@@ -199,28 +238,34 @@ def check_klipper():
     try:
         klipper_config = alarm_manager.get_diagnostic_config('klipper')
         
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(klipper_config.get('timeout', 2))
-        result = sock.connect_ex((
-            klipper_config.get('host', 'localhost'),
-            klipper_config.get('port', 7125)
-        ))
-        sock.close()
-        
-        if result == 0:
-            diagnostics['klipper'] = {
-                'status': 'ok',
-                'message': 'Klipper/Moonraker accessible'
-            }
-            logger.info(diagnostics['klipper']['message'])
-            return True
-        else:
+        # One round-trip tells us both that Moonraker is up and Klipper's state
+        try:
+            results = _query_moonraker(
+                klipper_config.get('host', 'localhost'),
+                klipper_config.get('port', 7125),
+                klipper_config.get('timeout', 2)
+            )
+        except OSError:
             diagnostics['klipper'] = {
                 'status': 'error',
                 'message': 'Klipper/Moonraker not accessible'
             }
             logger.warning(diagnostics['klipper']['message'])
             return False
+        
+        message = 'Klipper/Moonraker accessible'
+        # printer.info errors out while Klippy is disconnected; server.info
+        # still reports the state in that case
+        klippy_state = (results.get('printer.info', {}).get('state')
+                        or results.get('server.info', {}).get('klippy_state'))
+        if klippy_state:
+            message += f' (klippy {klippy_state})'
+        diagnostics['klipper'] = {
+            'status': 'ok',
+            'message': message
+        }
+        logger.info(diagnostics['klipper']['message'])
+        return True
             
     except Exception as e:
         diagnostics['klipper'] = {
@@ -239,19 +284,24 @@ def check_camera():
         camera_config = alarm_manager.get_diagnostic_config('camera')
         camera_devices = camera_config.get('devices', ['/dev/video0', '/dev/video1'])
         
-        camera_found = any(Path(p).exists() for p in camera_devices)
+        # One directory read answers every configured /dev/video* path and
+        # names what is present, instead of a stat per candidate
+        video_nodes = sorted(e.path for e in os.scandir('/dev') if e.name.startswith('video'))
+        found = [p for p in camera_devices
+                 if p in video_nodes or (not p.startswith('/dev/video') and Path(p).exists())]
         
-        if camera_found:
+        if found:
             diagnostics['camera'] = {
                 'status': 'ok',
-                'message': 'Camera device detected'
+                'message': f'Camera device detected ({", ".join(found)})'
             }
             logger.info(diagnostics['camera']['message'])
             return True
         else:
             diagnostics['camera'] = {
                 'status': 'error',
-                'message': 'No camera device found'
+                'message': ('No camera device found'
+                            + (f' (present: {", ".join(video_nodes)})' if video_nodes else ''))
             }
             logger.warning(diagnostics['camera']['message'])
             return False
@@ -367,16 +417,34 @@ def check_microphone():
         logger.warning(diagnostics['microphone']['message'])
         return False
 
+# (result key, check) in report order
+DIAGNOSTIC_CHECKS = (
+    ('temperature', check_temperature),
+    ('wifi', check_wifi),
+    ('klipper', check_klipper),
+    ('camera', check_camera),
+    ('speaker', check_speaker),
+    ('microphone', check_microphone),
+)
+
 def run_diagnostics():
-    """Run all diagnostic checks"""
+    """Run all diagnostic checks
+    
+    The checks are independent I/O probes (subprocesses, sockets, sysfs), so
+    they run concurrently and the total time is the slowest check rather than
+    the sum of all of them.
+    """
     logger.info("=== Starting Boot Diagnostics ===")
     
-    check_temperature()
-    check_wifi()
-    check_klipper()
-    check_camera()
-    check_speaker()
-    check_microphone()
+    with ThreadPoolExecutor(max_workers=len(DIAGNOSTIC_CHECKS)) as pool:
+        futures = [pool.submit(check) for _, check in DIAGNOSTIC_CHECKS]
+        for future in futures:
+            future.result()
+    
+    # Keep results in report order regardless of which check finished first
+    ordered = {name: diagnostics[name] for name, _ in DIAGNOSTIC_CHECKS if name in diagnostics}
+    diagnostics.clear()
+    diagnostics.update(ordered)
     
     logger.info("=== Diagnostics Complete ===")
 
@@ -474,25 +542,21 @@ def main():
     blink_duration = boot_pattern['blink_rate']
     max_blinks = boot_config.get('diagnostic_phase_duration', 10)
     
+    # Diagnostics run in the background (from the third blink, as before) so
+    # slow checks never stretch the blink pattern
+    diagnostics_thread = threading.Thread(target=run_diagnostics, daemon=True)
+    
     for i in range(max_blinks):
         if not running:
             break
         
         blink_led_rgb(*blink_color, duration=blink_duration)
         
-        # Run diagnostics during blinking
         if i == 2:
-            check_temperature()
-        elif i == 3:
-            check_wifi()
-        elif i == 4:
-            check_klipper()
-        elif i == 5:
-            check_camera()
-        elif i == 6:
-            check_speaker()
-        elif i == 7:
-            check_microphone()
+            diagnostics_thread.start()
+    
+    if diagnostics_thread.ident is not None:
+        diagnostics_thread.join()
     
     # Phase 2: Save diagnostics results
     save_diagnostics_log()
@@ -532,12 +596,7 @@ def main():
             
         # Re-run diagnostics every 5 minutes
         logger.info("Re-running diagnostics...")
-        check_temperature()
-        check_wifi()
-        check_klipper()
-        check_camera()
-        check_speaker()
-        check_microphone()
+        run_diagnostics()
         
         # Save updated diagnostics
         save_diagnostics_log()
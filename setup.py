@@ -51,6 +51,7 @@ setup(
     url="https://github.com/apku04/skipper-face-tracker",
     
     packages=find_packages(exclude=["tests", "docs", "scripts"]),
+    py_modules=["main"],
     python_requires=">=3.9",
     install_requires=requirements,
     
@@ -72,6 +73,10 @@ setup(
             'sounddevice>=0.4',
             'soundfile>=0.12',
         ],
+        # Faster preview JPEG encoding; needs the libturbojpeg system library
+        'stream': [
+            'PyTurboJPEG>=1.7.0',
+        ],
     },
     
     # CLI entry points
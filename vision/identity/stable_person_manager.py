@@ -12,13 +12,31 @@ Key advantages:
 - Works with cropped faces directly
 """
 
+import gzip
 import os
 import pickle
 import numpy as np
 import cv2
-from typing import Optional, Dict, List, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Optional, Dict, Iterable, List, Tuple
 import face_recognition
 
+# Enrollment photos are decoded at half resolution (~4x less libjpeg work)
+# only if the half-size image keeps at least this short side; smaller or
+# already-cropped photos are read at full size so faces stay above the
+# detector's minimum size
+REDUCED_DECODE_MIN_SIDE = 500
+
+
+def _load_enrollment_image(path: str) -> Tuple[Optional[np.ndarray], bool]:
+    """Decode an enrollment photo; returns (BGR image or None, was_reduced)"""
+    img = cv2.imread(path, cv2.IMREAD_REDUCED_COLOR_2)
+    if img is not None and min(img.shape[:2]) >= REDUCED_DECODE_MIN_SIDE:
+        return img, True
+    return cv2.imread(path), False
+
 
 class StablePersonManager:
     """
@@ -31,6 +49,12 @@ class StablePersonManager:
         self.db_path = db_path
         self.people = {}  # name -> list of 128D embeddings
         
+        # Every embedding, stored or queried, is taken from a box found by the
+        # same detector, so enrollment and identify() stay comparable. The CNN
+        # detector is only practical (and batchable) on a CUDA-enabled dlib
+        import dlib
+        self.detector_model = 'cnn' if getattr(dlib, 'DLIB_USE_CUDA', False) else 'hog'
+        
         print("✓ Initialized face_recognition (dlib-based, stable)")
         
         # Load existing database
@@ -40,7 +64,11 @@ class StablePersonManager:
         """Load face database from disk"""
         if os.path.exists(self.db_path):
             try:
+                # Databases written before gzip was used are plain pickles
                 with open(self.db_path, 'rb') as f:
+                    compressed = f.read(2) == b'\x1f\x8b'
+                opener = gzip.open if compressed else open
+                with opener(self.db_path, 'rb') as f:
                     self.people = pickle.load(f)
                 print(f"✓ Loaded {len(self.people)} people from {self.db_path}")
             except Exception as e:
@@ -54,32 +82,42 @@ class StablePersonManager:
         """Save face database to disk"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         try:
-            with open(self.db_path, 'wb') as f:
-                pickle.dump(self.people, f)
+            # Protocol 5 writes the embedding arrays as raw buffers; level 1
+            # gzip roughly halves them for little more than a memcpy
+            with gzip.open(self.db_path, 'wb', compresslevel=1) as f:
+                pickle.dump(self.people, f, protocol=5)
             print(f"✓ Saved database to {self.db_path}")
         except Exception as e:
             print(f"⚠ Failed to save database: {e}")
     
-    def _get_embedding(self, face_img: np.ndarray) -> Optional[np.ndarray]:
+    def _get_embedding(self, face_img: np.ndarray,
+                       face_locations: Optional[List[tuple]] = None) -> Optional[np.ndarray]:
         """
         Extract 128D embedding from face image
         
         Args:
             face_img: Face image (BGR format from OpenCV)
+            face_locations: Boxes already found by detector_model (skips
+                detection); None to detect here
         
         Returns:
             128D embedding vector, or None if face not detected
         """
         try:
             # face_recognition expects RGB
-            if len(face_img.shape) == 3 and face_img.shape[2] == 3:
+            if face_img.ndim == 3 and face_img.shape[2] == 3:
                 face_rgb = cv2.cvtColor(face_img, cv2.COLOR_BGR2RGB)
             else:
                 face_rgb = face_img
             
+            if face_locations is None:
+                face_locations = face_recognition.face_locations(
+                    face_rgb, model=self.detector_model)
+            
             # Get face encodings (128D embeddings)
             # model='large' uses more accurate CNN model
-            encodings = face_recognition.face_encodings(face_rgb, model='large')
+            encodings = face_recognition.face_encodings(
+                face_rgb, known_face_locations=face_locations, model='large')
             
             if len(encodings) == 0:
                 return None
@@ -110,18 +148,20 @@ class StablePersonManager:
         # Convert to 0-1 range (cosine is -1 to 1)
         return float((similarity + 1.0) / 2.0)
     
-    def add_person_from_face(self, name: str, face_img: np.ndarray) -> bool:
+    def add_person_from_face(self, name: str, face_img: np.ndarray,
+                             face_locations: Optional[List[tuple]] = None) -> bool:
         """
         Add a face embedding for a person
         
         Args:
             name: Person's name
             face_img: Face image (BGR format from OpenCV)
+            face_locations: Boxes already found by detector_model, if any
         
         Returns:
             True if successfully added, False otherwise
         """
-        embedding = self._get_embedding(face_img)
+        embedding = self._get_embedding(face_img, face_locations)
         
         if embedding is None:
             return False
@@ -134,26 +174,118 @@ class StablePersonManager:
         
         return True
     
-    def add_person_from_images(self, name: str, image_paths: List[str]) -> int:
+    def _add_loaded_image(self, name: str, img_path: str, img: Optional[np.ndarray],
+                          reduced: bool = False,
+                          face_locations: Optional[List[tuple]] = None) -> bool:
+        """
+        add_person_from_face for one enrollment image; never raises
+        
+        A half-resolution decode that yields no embedding is retried once at
+        full resolution, in case the face was too small after downscaling.
+        """
+        try:
+            if img is not None and self.add_person_from_face(name, img, face_locations):
+                return True
+            if reduced:
+                img = cv2.imread(img_path)
+                return img is not None and self.add_person_from_face(name, img)
+            return False
+        except Exception as e:
+            print(f"⚠ Failed to load {img_path}: {e}")
+            return False
+    
+    def add_person_from_images(self, name: str, image_paths: Iterable[str]) -> int:
         """
         Add multiple face embeddings for a person
         
         Args:
             name: Person's name
-            image_paths: List of image file paths
+            image_paths: Image file paths (any iterable, consumed lazily)
         
         Returns:
             Number of successfully added embeddings
         """
         count = 0
-        for img_path in image_paths:
-            try:
-                img = cv2.imread(img_path)
-                if img is not None:
-                    if self.add_person_from_face(name, img):
+        # Decode the next few images on worker threads while the current one
+        # is being embedded (imread releases the GIL during file I/O and
+        # decode). Embedding stays on this thread, in input order, so the
+        # database is only touched here
+        lookahead = max(1, min(4, os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=lookahead) as loader:
+            paths = iter(image_paths)
+            pending = deque((path, loader.submit(_load_enrollment_image, path))
+                            for path in islice(paths, lookahead))
+            while pending:
+                img_path, future = pending.popleft()
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.append((next_path, loader.submit(_load_enrollment_image, next_path)))
+                try:
+                    img, reduced = future.result()
+                except Exception as e:
+                    img, reduced = None, False
+                    print(f"⚠ Failed to load {img_path}: {e}")
+                
+                if self._add_loaded_image(name, img_path, img, reduced):
+                    count += 1
+        
+        if count > 0:
+            self.save_database()
+        
+        return count
+    
+    def add_person_from_images_batched(self, name: str, image_paths: Iterable[str],
+                                       batch_size: int = 16) -> int:
+        """
+        Add multiple face embeddings for a person, detecting faces in batches
+        
+        Uses face_recognition.batch_face_locations (dlib CNN detector), which
+        only pays off on a CUDA-enabled dlib; otherwise this is the same as
+        add_person_from_images. A group whose batch fails is retried one
+        image at a time.
+        
+        Args:
+            name: Person's name
+            image_paths: Image file paths (any iterable, consumed lazily)
+            batch_size: Images per detector call
+        
+        Returns:
+            Number of successfully added embeddings
+        """
+        if self.detector_model != 'cnn':
+            return self.add_person_from_images(name, image_paths)
+        
+        count = 0
+        paths = iter(image_paths)
+        while True:
+            chunk = list(islice(paths, batch_size))
+            if not chunk:
+                break
+            
+            # The CNN batch needs equal-sized images, so group by shape
+            groups: Dict[tuple, List[Tuple[str, np.ndarray, bool]]] = {}
+            for img_path in chunk:
+                img, reduced = _load_enrollment_image(img_path)
+                if img is None:
+                    print(f"⚠ Failed to load {img_path}")
+                    continue
+                groups.setdefault(img.shape, []).append((img_path, img, reduced))
+            
+            for group in groups.values():
+                try:
+                    locations = face_recognition.batch_face_locations(
+                        [np.ascontiguousarray(img[:, :, ::-1]) for _, img, _ in group],
+                        number_of_times_to_upsample=0, batch_size=len(group))
+                except Exception as e:
+                    print(f"⚠ Batched detection failed ({e}); retrying one at a time")
+                    locations = [None] * len(group)
+                
+                # No boxes (empty list) means nothing was found at this size,
+                # which _add_loaded_image retries at full resolution if reduced
+                for (img_path, img, reduced), boxes in zip(group, locations):
+                    if self._add_loaded_image(name, img_path, img, reduced,
+                                              boxes[:1] if boxes is not None else None):
                         count += 1
-            except Exception as e:
-                print(f"⚠ Failed to load {img_path}: {e}")
         
         if count > 0:
             self.save_database()
@@ -81,8 +81,9 @@ def test_inference(vdevice, hef, network_group, test_image_path=None):
             frame = cv2.imread(test_image_path)
             if frame is not None:
                 frame = cv2.resize(frame, (width, height))
-                # Convert BGR to RGB
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                # BGR to RGB as a strided view; the float32 conversion
+                # below makes the only copy
+                frame = frame[:, :, ::-1]
                 print(f"✓ Loaded test image: {test_image_path}")
         else:
             # Create random test data
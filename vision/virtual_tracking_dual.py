@@ -18,20 +18,21 @@ Each camera shows:
 
 import cv2
 import numpy as np
+import os
 import time
 import threading
-from queue import Queue
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from queue import Queue, Empty, Full
 from flask import Flask, Response, render_template_string
-from picamera2 import Picamera2
-from picamera2.devices import Hailo
+
+# picamera2/libcamera, Hailo and face_recognition are imported where they are
+# first needed so that --help and module import stay fast
 
 # Local imports (identity is in vision/identity/)
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))  # Add project root
 
-from vision.identity.stable_person_manager import StablePersonManager
-
 # Stereo depth is optional (moved to archive)
 try:
     from stereo_depth import StereoDepthCalculator
@@ -39,14 +40,40 @@ try:
 except ImportError:
     STEREO_AVAILABLE = False
 
+# TurboJPEG (libjpeg-turbo bindings) is optional: it encodes straight to bytes
+# and is faster than cv2.imencode; falls back to OpenCV if not installed.
+# Loaded on the first preview frame, not at import (it dlopens libturbojpeg)
+_turbojpeg = None
+_turbojpeg_tried = False
+
+
+def _get_turbojpeg():
+    """Get the shared TurboJPEG encoder, or None if it is unavailable"""
+    global _turbojpeg, _turbojpeg_tried
+    if not _turbojpeg_tried:
+        _turbojpeg_tried = True
+        try:
+            from turbojpeg import TurboJPEG
+            _turbojpeg = TurboJPEG()
+        except (ImportError, OSError, RuntimeError):
+            _turbojpeg = None
+    return _turbojpeg
+
 # === Configuration ===
 CAMERA_WIDTH = 800
 CAMERA_HEIGHT = 800  # Higher resolution for better quality, will resize for Hailo
 CAMERA_FPS = 15  # Lower FPS for better quality
+# Browser preview width; the combined dual view is downscaled to this before
+# JPEG encoding (0 = keep full size). Detection always uses full frames
+STREAM_WIDTH = 800
 
 # Hailo expects 640x640
 HAILO_WIDTH = 640
 HAILO_HEIGHT = 640
+# How long the inference worker waits for the other camera's frame
+HAILO_BATCH_WINDOW = 0.005
+# Longest a camera thread waits for its batched result before skipping
+HAILO_RESULT_TIMEOUT = 1.0
 
 # YuNet face detector model
 YUNET_MODEL = "/usr/share/opencv4/face_detection_yunet_2023mar.onnx"
@@ -57,12 +84,32 @@ AZIMUTH_MAX = 13.0
 ALTITUDE_MIN = 4.0    # Inverted: positive = down
 ALTITUDE_MAX = -4.0   # Inverted: negative = up
 
+# CPU pinning: camera thread i runs on CPU (CAMERA_CPU_BASE + i); the main
+# thread, web server and stream encoders stay on the CPUs below that
+CAMERA_CPU_BASE = 2
+
 # Tracking parameters
 PIXELS_PER_DEGREE = 50  # How many pixels = 1 degree
 DEADBAND_RADIUS = 80    # Don't move within this radius
 DAMPING_RADIUS = 160    # Progressive damping zone
 BOX_MARGIN = 0.30       # 30% margin for box-based tracking
 
+# Frames per FPS measurement window
+FPS_WINDOW = 30
+# How long a recognized name is kept without a fresh confident match
+RECOGNITION_HOLD_NS = 3_000_000_000
+
+
+def _set_cpu_affinity(cpus):
+    """Pin the calling thread to the given CPUs (no-op where unsupported)"""
+    try:
+        available = os.sched_getaffinity(0)
+        cpus = set(cpus) & available
+        if cpus:
+            os.sched_setaffinity(0, cpus)
+    except (AttributeError, OSError):
+        pass
+
 
 class SCRFDParser:
     """
@@ -73,11 +120,25 @@ class SCRFDParser:
         self.input_size = (HAILO_WIDTH, HAILO_HEIGHT)
         self.score_threshold = 0.6  # Balanced threshold
         self.nms_threshold = 0.3  # Stricter NMS
+        self.max_faces = 5
+        # sigmoid(x) > t  <=>  x > logit(t): threshold raw scores, exp() survivors only
+        self.score_logit = float(np.log(self.score_threshold / (1.0 - self.score_threshold)))
         self.logged_output_info = False
         
         # SCRFD uses 3 feature pyramid scales with strides [8, 16, 32]
         self.fpn_strides = [8, 16, 32]
         self.num_anchors = 2  # 2 anchor points per location
+        
+        # Anchor centers per stride, laid out in the same (y, x, anchor) order
+        # as the flattened model outputs
+        self.anchor_centers = {}
+        for stride in self.fpn_strides:
+            feat_h = self.input_size[1] // stride
+            feat_w = self.input_size[0] // stride
+            ys, xs = np.mgrid[:feat_h, :feat_w]
+            centers = np.stack([(xs + 0.5) * stride, (ys + 0.5) * stride], axis=-1)
+            centers = centers.reshape(-1, 2).astype(np.float32)
+            self.anchor_centers[stride] = np.repeat(centers, self.num_anchors, axis=0)
     
     def _distance2bbox(self, points, distances, stride):
         """Convert distance predictions to bounding boxes"""
@@ -87,35 +148,6 @@ class SCRFDParser:
         y2 = points[:, 1] + distances[:, 3] * stride
         return np.stack([x1, y1, x2, y2], axis=1)
     
-    def _nms(self, boxes, scores):
-        """Non-maximum suppression"""
-        if len(boxes) == 0:
-            return []
-        
-        x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
-        areas = (x2 - x1) * (y2 - y1)
-        order = scores.argsort()[::-1]
-        
-        keep = []
-        while order.size > 0:
-            i = order[0]
-            keep.append(i)
-            
-            xx1 = np.maximum(x1[i], x1[order[1:]])
-            yy1 = np.maximum(y1[i], y1[order[1:]])
-            xx2 = np.minimum(x2[i], x2[order[1:]])
-            yy2 = np.minimum(y2[i], y2[order[1:]])
-            
-            w = np.maximum(0.0, xx2 - xx1)
-            h = np.maximum(0.0, yy2 - yy1)
-            inter = w * h
-            
-            iou = inter / (areas[i] + areas[order[1:]] - inter + 1e-6)
-            inds = np.where(iou <= self.nms_threshold)[0]
-            order = order[inds + 1]
-        
-        return keep
-    
     def parse(self, outputs):
         """Parse SCRFD outputs to face boxes"""
         # Log output structure once for debugging
@@ -137,10 +169,6 @@ class SCRFDParser:
             
             # Parse each FPN level (stride 8, 16, 32)
             for stride_idx, stride in enumerate(self.fpn_strides):
-                # Get feature map size for this stride
-                feat_h = self.input_size[1] // stride
-                feat_w = self.input_size[0] // stride
-                
                 # Get outputs for this stride
                 if stride == 8:
                     bbox_pred = outputs['scrfd_2_5g/conv43']  # (80, 80, 8)
@@ -153,36 +181,19 @@ class SCRFDParser:
                     cls_score = outputs['scrfd_2_5g/conv55']  # (20, 20, 2)
                 
                 # Reshape: (H, W, C) -> (H*W*num_anchors, C/num_anchors)
-                bbox_pred = bbox_pred.reshape(feat_h, feat_w, self.num_anchors, 4)
-                cls_score = cls_score.reshape(feat_h, feat_w, self.num_anchors, 1)
-                
-                # Apply sigmoid to get probabilities
-                scores = 1.0 / (1.0 + np.exp(-cls_score))
-                scores = scores.reshape(-1)
+                logits = cls_score.reshape(-1)
                 bbox_pred = bbox_pred.reshape(-1, 4)
                 
-                # Filter by score threshold
-                valid_idx = scores > self.score_threshold
+                # Filter by score threshold before the sigmoid
+                valid_idx = logits > self.score_logit
                 if not np.any(valid_idx):
                     continue
                 
-                valid_scores = scores[valid_idx]
+                valid_scores = 1.0 / (1.0 + np.exp(-logits[valid_idx]))
                 valid_bboxes = bbox_pred[valid_idx]
                 
-                # Generate anchor points for valid detections
-                anchor_centers = []
-                valid_positions = np.where(valid_idx)[0]
-                for pos in valid_positions:
-                    anchor_idx = pos % self.num_anchors
-                    grid_idx = pos // self.num_anchors
-                    y = grid_idx // feat_w
-                    x = grid_idx % feat_w
-                    
-                    cx = (x + 0.5) * stride
-                    cy = (y + 0.5) * stride
-                    anchor_centers.append([cx, cy])
-                
-                anchor_centers = np.array(anchor_centers, dtype=np.float32)
+                # Look up precomputed anchor points for valid detections
+                anchor_centers = self.anchor_centers[stride][valid_idx]
                 
                 # Decode bboxes from anchor deltas
                 boxes = self._distance2bbox(anchor_centers, valid_bboxes, stride)
@@ -202,14 +213,14 @@ class SCRFDParser:
                 print(f"SCRFD: Found {len(all_boxes)} raw detections before NMS (scores: {all_scores.min():.3f}-{all_scores.max():.3f})")
                 self.logged_detection_count = True
             
-            # Apply NMS
-            keep = self._nms(all_boxes, all_scores)
-            
-            # Sort by score and keep only top 5 detections
-            if len(keep) > 5:
-                keep_scores = all_scores[keep]
-                top_indices = np.argsort(keep_scores)[::-1][:5]
-                keep = [keep[i] for i in top_indices]
+            # Apply NMS (OpenCV's C++ implementation); returns indices sorted
+            # by score. NMSBoxes' top_k caps the candidates *before*
+            # suppression, so cap the survivors afterwards instead
+            xywh = all_boxes.copy()
+            xywh[:, 2:] -= xywh[:, :2]
+            keep = cv2.dnn.NMSBoxes(xywh.tolist(), all_scores.tolist(),
+                                    self.score_threshold, self.nms_threshold)
+            keep = np.asarray(keep, dtype=np.int64).reshape(-1)[:self.max_faces]
             
             # Convert to (x, y, w, h) format and scale to camera resolution
             faces = []
@@ -447,16 +458,154 @@ class VirtualTracker:
         }
 
 
+class HailoBatcher:
+    """
+    Coalesces frames from several camera threads into one batched Hailo run
+    
+    Camera threads call submit(frame) and wait on the returned Future. A single
+    worker thread collects up to batch_size frames (waiting at most
+    HAILO_BATCH_WINDOW for stragglers), runs them through the device in one
+    call and hands each camera its own outputs back.
+    """
+    
+    def __init__(self, hailo, batch_size, window=HAILO_BATCH_WINDOW):
+        self.hailo = hailo
+        self.batch_size = batch_size
+        self.window = window
+        self.queue = Queue(maxsize=batch_size)
+        # Batch input tensor, allocated on first use and refilled in place
+        self._input = None
+        self.running = True
+        self.thread = threading.Thread(target=self._worker, name="hailo-batcher", daemon=True)
+        self.thread.start()
+    
+    def submit(self, frame):
+        """Queue one frame for inference; returns a Future for its outputs"""
+        future = Future()
+        queued = False
+        while self.running and not queued:
+            try:
+                self.queue.put((frame, future), timeout=0.1)
+                queued = True
+            except Full:
+                pass
+        if not queued:
+            future.set_exception(RuntimeError("Hailo batcher stopped"))
+        elif not self.running:
+            # close() may have drained the queue between our running check
+            # and the put; fail what is left so no caller waits forever
+            self._fail_pending()
+        return future
+    
+    def close(self):
+        """Stop the worker and fail any frames still waiting"""
+        self.running = False
+        self.thread.join(timeout=1.0)
+        self._fail_pending()
+    
+    def _fail_pending(self):
+        while True:
+            try:
+                _, future = self.queue.get_nowait()
+            except Empty:
+                break
+            if not future.done():
+                future.set_exception(RuntimeError("Hailo batcher stopped"))
+    
+    def _collect(self):
+        """Block for the first frame, then gather the rest of the batch"""
+        try:
+            batch = [self.queue.get(timeout=0.1)]
+        except Empty:
+            return []
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+    
+    def _fill_input(self, frames):
+        """Copy frames into the reusable batch tensor (run() is synchronous,
+        so the buffer is free again once it returns)"""
+        first = frames[0]
+        if self._input is None or self._input.shape[1:] != first.shape:
+            self._input = np.empty((self.batch_size,) + first.shape, dtype=first.dtype)
+        for i, frame in enumerate(frames):
+            np.copyto(self._input[i], frame)
+        # The network is configured for a fixed batch size, so pad a short
+        # batch (one camera late or stopped) by repeating the last frame
+        for i in range(len(frames), self.batch_size):
+            np.copyto(self._input[i], frames[-1])
+        return self._input
+    
+    def _worker(self):
+        while self.running:
+            # Claim each frame; a camera that gave up waiting has cancelled
+            # its future and may already have released the buffer
+            batch = [(frame, future) for frame, future in self._collect()
+                     if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            
+            try:
+                outputs = self.hailo.run(self._fill_input([frame for frame, _ in batch]))
+                if self.batch_size == 1:
+                    outputs = [outputs]
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(batch, outputs):
+                future.set_result(result)
+
+
+class LatestRequestSlot:
+    """
+    Single-producer/single-consumer handoff of the newest capture request
+    
+    put() replaces an item the consumer has not taken yet and returns it, so
+    the producer can release the stale buffer back to the camera (drop-oldest).
+    """
+    
+    def __init__(self):
+        self._item = None
+        self._cond = threading.Condition()
+    
+    def put(self, item):
+        with self._cond:
+            dropped = self._item
+            self._item = item
+            self._cond.notify()
+        return dropped
+    
+    def get(self, timeout=None):
+        """Take the newest item, waiting up to timeout; None if nothing arrived"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._item is not None, timeout=timeout)
+            item = self._item
+            self._item = None
+        return item
+
+
 class DualCameraTracker:
     """Main application with dual cameras"""
     
-    def __init__(self, camera_nums=[0, 1]):
+    def __init__(self, camera_nums=[0, 1], display=True):
         self.camera_nums = camera_nums
+        self.display = display  # False = headless, skip overlays and streaming
         self.hailo_model = "/usr/share/hailo-models/scrfd_2.5g_h8l.hef"
         
         # SHARED Hailo device (only one instance allowed)
         self.hailo = None
-        self.hailo_lock = threading.Lock()  # For thread-safe Hailo access
+        # Batches one frame per camera into a single device run, while each
+        # camera thread parses its own outputs in parallel
+        self.hailo_batcher = None
         
         # One camera, parser, and tracker per camera
         self.picam2_list = []
@@ -479,10 +628,11 @@ class DualCameraTracker:
         self.last_depth = None  # Store last calculated depth
         
         # Face recognition manager (Stable CPU-based, no crashes)
+        from vision.identity.stable_person_manager import StablePersonManager
         self.person_manager = StablePersonManager(db_path="models/face_db/faces_db_stable.pkl")
         self.recognition_interval = 15  # run recognition every N frames
         self.last_recognition = [None for _ in camera_nums]
-        self.last_recognition_time = [0.0 for _ in camera_nums]
+        self.last_recognition_time = [0 for _ in camera_nums]  # time.monotonic_ns()
         
         # YuNet face detector (much better than Haar cascade!)
         try:
@@ -499,9 +649,29 @@ class DualCameraTracker:
             print(f"⚠ YuNet failed ({e}), falling back to Haar cascade")
             self.face_detector = None
         
+        # Overlay geometry is fixed by the configured frame size
+        self._frame_center = (CAMERA_WIDTH // 2, CAMERA_HEIGHT // 2)
+        self._status_org = (10, CAMERA_HEIGHT - 10)
+        
         self.running = False
+        # Set by each camera thread once its camera is started (or failed)
+        self.camera_ready = [threading.Event() for _ in camera_nums]
+        # Latest annotated frame per camera (single slot, producer overwrites)
         self.latest_frames = [None, None]
+        self.frame_lock = threading.Lock()
+        # Stream clients wait on this instead of polling; frame_seq counts stores
+        self.frame_cond = threading.Condition(self.frame_lock)
+        self.frame_seq = 0
+        # Per-thread display buffers so each stream client composes without allocating
+        self._display = threading.local()
+        # Last encoded stream JPEG and the frame_seq it was made from, shared
+        # by all stream clients so each frame is encoded only once
+        self._jpeg_lock = threading.Lock()
+        self._jpeg = None
+        self._jpeg_seq = -1
         self.fps_list = [0.0, 0.0]
+        # Overlay text, formatted when the FPS is measured rather than per streamed frame
+        self.fps_labels = [f"Cam{n}: 0.0fps" for n in camera_nums]
     
     def _normalize_face_crop(self, face_crop: np.ndarray, target_size: int = 112) -> np.ndarray:
         """
@@ -566,10 +736,14 @@ class DualCameraTracker:
         """Start cameras and Hailo"""
         print(f"Initializing Cameras {self.camera_nums}...")
         
+        from picamera2.devices import Hailo
+        
         # Initialize shared Hailo device FIRST (before threads)
         print("Initializing shared Hailo device...")
-        self.hailo = Hailo(self.hailo_model)
-        print("✓ Hailo initialized (shared between cameras)")
+        batch_size = len(self.camera_nums)
+        self.hailo = Hailo(self.hailo_model, batch_size=batch_size)
+        self.hailo_batcher = HailoBatcher(self.hailo, batch_size)
+        print(f"✓ Hailo initialized (shared between cameras, batch size {batch_size})")
         
         self.running = True
         
@@ -580,11 +754,20 @@ class DualCameraTracker:
             thread.start()
             self.threads.append(thread)
         
-        # Wait a moment for threads to initialize
-        time.sleep(2)
+        # Wait for the cameras to come up instead of a fixed delay
+        for cam_num, ready in zip(self.camera_nums, self.camera_ready):
+            if not ready.wait(timeout=5.0):
+                print(f"⚠ Camera {cam_num} did not start within 5s")
+        
+        # Keep the supervisor (and the Flask threads it spawns) off the
+        # camera cores; done after the camera threads have pinned themselves
+        _set_cpu_affinity(set(range(CAMERA_CPU_BASE)))
         
         print("\n✓ Dual camera virtual tracking started")
-        print("  View at: http://localhost:5000")
+        if self.display:
+            print("  View at: http://localhost:5000")
+        else:
+            print("  Headless mode: no overlays or web stream")
         print("  Press Ctrl+C to stop\n")
         
     def stop(self):
@@ -599,6 +782,9 @@ class DualCameraTracker:
                 except:
                     pass
         
+        if self.hailo_batcher:
+            self.hailo_batcher.close()
+        
         if self.hailo:
             try:
                 self.hailo.close()
@@ -611,14 +797,32 @@ class DualCameraTracker:
         """Main processing loop for one camera"""
         cam_num = self.camera_nums[camera_idx]
         
+        # Give each inference thread its own core to avoid contention
+        _set_cpu_affinity({CAMERA_CPU_BASE + camera_idx})
+        
         try:
+            # Imported inside the try so a missing module is reported here and
+            # still releases start() instead of killing the thread silently
+            from picamera2 import Picamera2, MappedArray
+            from libcamera import Transform
+            from hailo_platform import HailoRTException
+            
             # Initialize camera (Hailo is already initialized in main thread)
             print(f"Camera {cam_num}: Initializing camera...")
             picam2 = Picamera2(cam_num)
             
             # Configure for better quality
+            # The ISP scales the lores stream to the Hailo input size and applies
+            # the 180° rotation, so no per-frame cv2.rotate/cv2.resize is needed
             config = picam2.create_preview_configuration(
                 main={"size": (CAMERA_WIDTH, CAMERA_HEIGHT), "format": "RGB888"},
+                lores={"size": (HAILO_WIDTH, HAILO_HEIGHT), "format": "RGB888"},
+                transform=Transform(hflip=1, vflip=1),
+                # Up to two requests are held by this pipeline (one in the
+                # capture slot, one in inference); extra buffers keep libcamera
+                # from dropping frames when a Hailo run stalls
+                buffer_count=6,
+                queue=True,
                 controls={
                     "FrameDurationLimits": (33333, 66666),  # 15-30 FPS range
                     "NoiseReductionMode": 2,  # High quality noise reduction
@@ -632,39 +836,71 @@ class DualCameraTracker:
         except Exception as e:
             print(f"Camera {cam_num}: ❌ Initialization failed - {e}")
             return
+        finally:
+            self.camera_ready[camera_idx].set()
         
         frame_count = 0
-        fps_start = time.time()
+        fps_start = time.monotonic_ns()
         
         parser = self.parser_list[camera_idx]
         tracker = self.tracker_list[camera_idx]
         
+        # Capture runs on its own thread so the next frame is being dequeued
+        # while this one is in inference; only the newest request is kept
+        slot = LatestRequestSlot()
+        capture_thread = threading.Thread(
+            target=self._capture_loop, args=(camera_idx, picam2, slot), daemon=True)
+        capture_thread.start()
+        
+        # Bind per-frame lookups to locals once, outside the hot loop
+        take_request = slot.get
+        submit_inference = self.hailo_batcher.submit
+        display = self.display
+        recognition_interval = self.recognition_interval
+        last_hailo_error_log = 0.0
+        
         while self.running:
             try:
-                # Capture frame
-                frame = picam2.capture_array()
-                
-                if frame is None or frame.size == 0:
-                    print(f"Camera {cam_num}: Empty frame!")
+                # Copy out only the display frame; Hailo reads the lores stream
+                # straight from the mapped camera buffer, which is held until
+                # inference finishes and then returned to libcamera
+                request = take_request(timeout=0.5)
+                if request is None:
                     continue
-                
-                # Rotate frame 180 degrees
-                frame = cv2.rotate(frame, cv2.ROTATE_180)
-                
-                # Resize frame for Hailo (640x640) while keeping original for display
-                frame_hailo = cv2.resize(frame, (HAILO_WIDTH, HAILO_HEIGHT))
-                
-                # Run Hailo inference (with lock for thread safety)
                 try:
-                    with self.hailo_lock:
-                        outputs = self.hailo.run(frame_hailo)
-                except Exception as hailo_err:
-                    print(f"Camera {cam_num}: Hailo error - {hailo_err}")
-                    outputs = None
+                    frame = request.make_array("main")
+                    
+                    if frame is None or frame.size == 0:
+                        print(f"Camera {cam_num}: Empty frame!")
+                        continue
+                    
+                    # Run Hailo inference batched with the other camera's frame
+                    try:
+                        with MappedArray(request, "lores") as lores:
+                            pending = submit_inference(lores.array)
+                            try:
+                                outputs = pending.result(timeout=HAILO_RESULT_TIMEOUT)
+                            except FutureTimeout:
+                                # Don't let the worker read lores once released
+                                pending.cancel()
+                                raise
+                    except (HailoRTException, RuntimeError, FutureTimeout) as hailo_err:
+                        # HailoRT failures (and the batcher shutting down or
+                        # timing out) skip
+                        # this frame; log at most every 5s so a failing device
+                        # does not flood the console. Anything else propagates
+                        # to the loop's handler with a traceback.
+                        now = time.monotonic()
+                        if now - last_hailo_error_log > 5.0:
+                            print(f"Camera {cam_num}: Hailo error - {hailo_err}")
+                            last_hailo_error_log = now
+                        outputs = None
+                finally:
+                    request.release()
                 
                 # Parse detections (returns empty for now)
                 faces = []
-                if outputs:
+                if outputs is not None and len(outputs) > 0:
                     faces = parser.parse(outputs)
                     if faces and frame_count % 60 == 0:
                         print(f"Camera {cam_num}: ✓ Hailo SCRFD detected {len(faces)} face(s)")
@@ -752,7 +988,7 @@ class DualCameraTracker:
                 name = None
                 confidence = 0.0
                 try:
-                    if face_box is not None and frame_count % self.recognition_interval == 0:
+                    if face_box is not None and frame_count % recognition_interval == 0:
                         x, y, w, h = face_box
                         # Clamp to frame boundaries
                         x = max(0, x)
@@ -769,16 +1005,16 @@ class DualCameraTracker:
                                 # Confident match - use it
                                 name = name_found
                                 self.last_recognition[camera_idx] = name_found
-                                self.last_recognition_time[camera_idx] = time.time()
+                                self.last_recognition_time[camera_idx] = time.monotonic_ns()
                             else:
                                 # Not confident enough - only use cached name briefly
-                                if time.time() - self.last_recognition_time[camera_idx] < 3.0:
+                                if time.monotonic_ns() - self.last_recognition_time[camera_idx] < RECOGNITION_HOLD_NS:
                                     name = self.last_recognition[camera_idx]
                                 else:
                                     name = None
                     else:
                         # Use cached name if still fresh (shorter 3s window)
-                        if time.time() - self.last_recognition_time[camera_idx] < 3.0:
+                        if time.monotonic_ns() - self.last_recognition_time[camera_idx] < RECOGNITION_HOLD_NS:
                             name = self.last_recognition[camera_idx]
                         else:
                             name = None
@@ -787,31 +1023,40 @@ class DualCameraTracker:
                     name = None
                     confidence = 0.0
 
-                # Draw visualization
-                vis_frame = self._draw_visualization(frame.copy(), tracking_info)
+                if display:
+                    # Draw visualization in place: make_array() hands us a
+                    # fresh buffer and nothing reads it after this point
+                    vis_frame = self._draw_visualization(frame, tracking_info)
 
-                # Overlay identity if available (with confidence score)
-                if name and tracking_info.get('inner_box'):
-                    try:
-                        x1, y1, x2, y2 = tracking_info['inner_box']
-                        # Show name and confidence score
-                        if confidence > 0:
-                            label = f"{name} ({confidence:.2f})"
-                        else:
-                            label = name
-                        cv2.putText(vis_frame, label, (x1, max(y1-10, 20)),
-                                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-                    except Exception:
-                        pass
-                
-                # Store latest frame
-                self.latest_frames[camera_idx] = vis_frame
+                    # Overlay identity if available (with confidence score)
+                    if name and tracking_info.get('inner_box'):
+                        try:
+                            x1, y1, x2, y2 = tracking_info['inner_box']
+                            # Show name and confidence score
+                            if confidence > 0:
+                                label = f"{name} ({confidence:.2f})"
+                            else:
+                                label = name
+                            cv2.putText(vis_frame, label, (x1, max(y1-10, 20)),
+                                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+                        except Exception:
+                            pass
+                    
+                    # Store latest frame
+                    with self.frame_cond:
+                        self.latest_frames[camera_idx] = vis_frame
+                        self.frame_seq += 1
+                        self.frame_cond.notify_all()
                 
-                # Update FPS
+                # Update FPS over the last FPS_WINDOW frames: one clock read
+                # per window instead of per frame
                 frame_count += 1
-                if frame_count % 10 == 0:
-                    elapsed = time.time() - fps_start
-                    self.fps_list[camera_idx] = frame_count / elapsed
+                if frame_count % FPS_WINDOW == 0:
+                    now = time.monotonic_ns()
+                    fps = FPS_WINDOW * 1e9 / (now - fps_start)
+                    self.fps_list[camera_idx] = fps
+                    self.fps_labels[camera_idx] = f"Cam{cam_num}: {fps:.1f}fps"
+                    fps_start = now
                     
             except Exception as e:
                 import traceback
@@ -819,6 +1064,26 @@ class DualCameraTracker:
                 print(traceback.format_exc())
                 time.sleep(0.1)
     
+    def _capture_loop(self, camera_idx, picam2, slot):
+        """Feed the newest capture request for one camera into its slot"""
+        cam_num = self.camera_nums[camera_idx]
+        capture_request = picam2.capture_request
+        
+        while self.running:
+            try:
+                dropped = slot.put(capture_request())
+            except Exception as e:
+                print(f"Camera {cam_num} capture error: {e}")
+                time.sleep(0.1)
+                continue
+            if dropped is not None:
+                dropped.release()
+        
+        # Return a request the processing loop did not pick up
+        leftover = slot.get(timeout=0)
+        if leftover is not None:
+            leftover.release()
+    
     def _calculate_stereo_depth(self):
         """Calculate 3D depth from both camera face positions"""
         try:
@@ -857,18 +1122,17 @@ class DualCameraTracker:
     
     def _draw_visualization(self, frame, tracking_info):
         """Draw all tracking visualization on frame"""
-        h, w = frame.shape[:2]
-        center_x = w // 2
-        center_y = h // 2
+        center = self._frame_center
+        status_org = self._status_org
         
         # Draw deadband circle (light gray)
-        cv2.circle(frame, (center_x, center_y), DEADBAND_RADIUS, (200, 200, 200), 2)
+        cv2.circle(frame, center, DEADBAND_RADIUS, (200, 200, 200), 2)
         
         # Draw damping circle (darker gray)
-        cv2.circle(frame, (center_x, center_y), DAMPING_RADIUS, (128, 128, 128), 2)
+        cv2.circle(frame, center, DAMPING_RADIUS, (128, 128, 128), 2)
         
         # Draw center crosshair (red) - RGB format
-        cv2.drawMarker(frame, (center_x, center_y), (255, 0, 0), 
+        cv2.drawMarker(frame, center, (255, 0, 0), 
                       cv2.MARKER_CROSS, 20, 2)
         
         if tracking_info['has_target']:
@@ -899,10 +1163,10 @@ class DualCameraTracker:
                 zone = "TRACKING"
                 color = (255, 0, 0)  # RGB: Red
             
-            cv2.putText(frame, zone, (10, h-10), 
+            cv2.putText(frame, zone, status_org, 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
         else:
-            cv2.putText(frame, "NO TARGET", (10, h-10), 
+            cv2.putText(frame, "NO TARGET", status_org, 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)  # RGB: Red
         
         # Motor angles
@@ -915,37 +1179,86 @@ class DualCameraTracker:
         
         return frame
     
+    def wait_for_frame(self, last_seq, timeout=1.0):
+        """Block until a camera stores a frame newer than last_seq; returns the new seq"""
+        with self.frame_cond:
+            self.frame_cond.wait_for(lambda: self.frame_seq != last_seq, timeout=timeout)
+            return self.frame_seq
+    
+    def get_jpeg(self, seq):
+        """Return the stream JPEG for frame seq, encoding at most once across clients"""
+        with self._jpeg_lock:
+            if self._jpeg_seq < seq:
+                # Lower quality (50 instead of default 95) significantly
+                # reduces CPU load without affecting detection
+                frame = self.get_combined_frame()
+                if STREAM_WIDTH and frame.shape[1] > STREAM_WIDTH:
+                    scale = STREAM_WIDTH / frame.shape[1]
+                    frame = cv2.resize(frame, (STREAM_WIDTH, int(frame.shape[0] * scale)),
+                                       interpolation=cv2.INTER_AREA)
+                turbojpeg = _get_turbojpeg()
+                if turbojpeg is not None:
+                    self._jpeg = turbojpeg.encode(frame, quality=50)
+                    self._jpeg_seq = seq
+                else:
+                    ret, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 50])
+                    if ret:
+                        self._jpeg = jpeg.tobytes()
+                        self._jpeg_seq = seq
+            return self._jpeg
+    
+    def _get_display_buf(self, shape):
+        """Return this thread's reusable display buffer, (re)allocating on shape change"""
+        buf = getattr(self._display, 'buf', None)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.uint8)
+            self._display.buf = buf
+        return buf
+    
     def get_combined_frame(self):
-        """Get side-by-side combined frame (or single camera frame)"""
+        """
+        Get side-by-side combined frame (or single camera frame)
+        
+        The returned array is a per-thread buffer that is reused by the
+        next call from the same thread.
+        """
         num_cameras = len(self.camera_nums)
         
+        # Snapshot both slots together so the pair is consistent
+        with self.frame_lock:
+            frame0, frame1 = self.latest_frames[0], self.latest_frames[1]
+        
         # Single camera mode
         if num_cameras == 1:
-            if self.latest_frames[0] is None:
+            if frame0 is None:
                 blank = np.zeros((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
                 cv2.putText(blank, "Waiting for camera...", (CAMERA_WIDTH//4, CAMERA_HEIGHT//2),
                            cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
                 return blank
             
-            frame = self.latest_frames[0].copy()
+            frame = self._get_display_buf(frame0.shape)
+            np.copyto(frame, frame0)
             
             # Add FPS overlay
-            cv2.putText(frame, f"Cam{self.camera_nums[0]}: {self.fps_list[0]:.1f}fps", 
+            cv2.putText(frame, self.fps_labels[0], 
                        (10, CAMERA_HEIGHT-40),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
             
             return frame
         
         # Dual camera mode
-        if self.latest_frames[0] is None or self.latest_frames[1] is None:
+        if frame0 is None or frame1 is None:
             # Return blank frame until both cameras ready
             blank = np.zeros((CAMERA_HEIGHT, CAMERA_WIDTH*2, 3), dtype=np.uint8)
             cv2.putText(blank, "Waiting for cameras...", (CAMERA_WIDTH//2, CAMERA_HEIGHT//2),
                        cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
             return blank
         
-        # Combine frames side-by-side
-        combined = np.hstack([self.latest_frames[0], self.latest_frames[1]])
+        # Combine frames side-by-side into the reusable display buffer
+        h0, w0 = frame0.shape[:2]
+        combined = self._get_display_buf((h0, w0 + frame1.shape[1], 3))
+        combined[:, :w0] = frame0
+        combined[:, w0:] = frame1
         
         # Calculate stereo depth if both cameras have faces
         depth_info = self._calculate_stereo_depth()
@@ -967,9 +1280,9 @@ class DualCameraTracker:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
         # Add FPS overlay for each camera
-        cv2.putText(combined, f"Cam0: {self.fps_list[0]:.1f}fps", (10, CAMERA_HEIGHT-40),
+        cv2.putText(combined, self.fps_labels[0], (10, CAMERA_HEIGHT-40),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
-        cv2.putText(combined, f"Cam1: {self.fps_list[1]:.1f}fps", (CAMERA_WIDTH+10, CAMERA_HEIGHT-40),
+        cv2.putText(combined, self.fps_labels[1], (CAMERA_WIDTH+10, CAMERA_HEIGHT-40),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
         
         # Add separator line
@@ -980,6 +1293,10 @@ class DualCameraTracker:
 
 # === Flask Web Server ===
 app = Flask(__name__)
+
+# Multipart framing around each streamed JPEG; joined in one allocation
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+MJPEG_PART_TRAILER = b'\r\n'
 tracker = None
 
 HTML_PAGE = """
@@ -1036,29 +1353,25 @@ def index():
 @app.route('/video_feed')
 def video_feed():
     def generate():
-        frame_skip = 0  # Skip frames to reduce streaming CPU load
         last_frame_time = time.time()
+        last_seq = 0
         
         while True:
             if tracker is None:
                 time.sleep(0.1)
                 continue
             
-            # Only encode every 3rd frame to reduce CPU (10fps instead of 30fps)
-            frame_skip += 1
-            if frame_skip % 3 != 0:
-                time.sleep(0.01)
+            # Let the camera threads pace the stream: block until a new frame
+            # is stored instead of waking up every 10ms to poll
+            seq = tracker.wait_for_frame(last_seq)
+            if seq == last_seq:
                 continue
+            last_seq = seq
             
-            frame = tracker.get_combined_frame()
-            
-            # Don't convert - JPEG expects RGB and picamera2 gives us RGB
-            # (The cv2.imencode handles it correctly)
-            
-            # Encode as JPEG with lower quality (50 instead of default 95)
-            # This significantly reduces CPU load without affecting detection
-            ret, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 50])
-            if not ret:
+            # Don't convert - picamera2's RGB888 is already BGR in memory.
+            # Encoded once per frame no matter how many clients are watching
+            jpeg = tracker.get_jpeg(seq)
+            if jpeg is None:
                 continue
             
             # Throttle to max 10fps for streaming
@@ -1068,8 +1381,7 @@ def video_feed():
                 time.sleep(0.1 - elapsed)
             last_frame_time = time.time()
             
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + jpeg.tobytes() + b'\r\n')
+            yield b''.join((MJPEG_PART_HEADER, jpeg, MJPEG_PART_TRAILER))
     
     return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
 
@@ -1082,6 +1394,8 @@ def main():
                        help='Camera indices to use (e.g., --cameras 0 for single camera, --cameras 0 1 for dual)')
     parser.add_argument('--single-camera', type=int, metavar='ID',
                        help='Use single camera mode (shortcut for --cameras ID)')
+    parser.add_argument('--no-display', action='store_true',
+                       help='Headless mode: skip overlay drawing and the web stream')
     args = parser.parse_args()
     
     # Handle single-camera shortcut
@@ -1102,12 +1416,16 @@ def main():
     print("Once this works, we'll connect to Klipper\n")
     
     # Create and start tracker
-    tracker = DualCameraTracker(camera_nums=camera_nums)
+    tracker = DualCameraTracker(camera_nums=camera_nums, display=not args.no_display)
     tracker.start()
     
-    # Start Flask server
+    # Start Flask server (or just keep tracking in headless mode)
     try:
-        app.run(host='0.0.0.0', port=5000, threaded=True)
+        if args.no_display:
+            while True:
+                time.sleep(1)
+        else:
+            app.run(host='0.0.0.0', port=5000, threaded=True)
     except KeyboardInterrupt:
         pass
     finally:
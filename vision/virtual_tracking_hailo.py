@@ -18,7 +18,6 @@ import cv2
 import numpy as np
 import time
 import threading
-from queue import Queue
 from flask import Flask, Response
 import io
 
@@ -41,6 +40,10 @@ ALTITUDE_MAX = 4.0
 # Flask app for streaming
 app = Flask(__name__)
 
+# Multipart framing around each streamed JPEG; joined in one allocation
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+MJPEG_PART_TRAILER = b'\r\n'
+
 class SCRFDParser:
     """Parse SCRFD model output to face detections"""
     
@@ -189,8 +192,9 @@ class HailoVirtualTracker:
         self.tracker = VirtualTracker()
         
         self.running = False
-        self.frame_queue = Queue(maxsize=2)
         self.latest_frame = None
+        self.frame_seq = 0
+        self.frame_cond = threading.Condition()
         self.fps = 0
         
     def start(self):
@@ -234,7 +238,7 @@ class HailoVirtualTracker:
     def _process_loop(self):
         """Main processing loop"""
         frame_count = 0
-        fps_start = time.time()
+        fps_start = time.monotonic()
         
         while self.running:
             try:
@@ -264,15 +268,19 @@ class HailoVirtualTracker:
                 # Draw visualization
                 vis_frame = self._draw_visualization(frame, best_face, tracking_info)
                 
-                # Update latest frame for streaming
-                self.latest_frame = vis_frame
+                # Update latest frame for streaming and wake the stream
+                with self.frame_cond:
+                    self.latest_frame = vis_frame
+                    self.frame_seq += 1
+                    self.frame_cond.notify_all()
                 
-                # Update FPS
+                # Update FPS (one clock read per frame)
                 frame_count += 1
-                if time.time() - fps_start >= 1.0:
-                    self.fps = frame_count / (time.time() - fps_start)
+                now = time.monotonic()
+                if now - fps_start >= 1.0:
+                    self.fps = frame_count / (now - fps_start)
                     frame_count = 0
-                    fps_start = time.time()
+                    fps_start = now
                     
                     # Print status
                     print(f"FPS: {self.fps:.1f} | "
@@ -304,8 +312,8 @@ class HailoVirtualTracker:
             return []
     
     def _draw_visualization(self, frame, face_box, tracking_info):
-        """Draw tracking visualization on frame"""
-        vis = frame.copy()
+        """Draw tracking visualization on frame (in place)"""
+        vis = frame
         h, w = vis.shape[:2]
         
         frame_center_x = w // 2
@@ -372,6 +380,12 @@ class HailoVirtualTracker:
     def get_frame(self):
         """Get latest frame for streaming"""
         return self.latest_frame
+    
+    def wait_for_frame(self, last_seq, timeout=1.0):
+        """Block until a frame newer than last_seq is stored; returns (seq, frame)"""
+        with self.frame_cond:
+            self.frame_cond.wait_for(lambda: self.frame_seq != last_seq, timeout=timeout)
+            return self.frame_seq, self.latest_frame
 
 
 # Flask routes
@@ -400,15 +414,21 @@ def index():
 @app.route('/video_feed')
 def video_feed():
     def generate():
+        last_seq = 0
         while True:
-            if tracker and tracker.latest_frame is not None:
-                frame = tracker.latest_frame
-                # Convert to JPEG
-                ret, jpeg = cv2.imencode('.jpg', cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
-                if ret:
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + jpeg.tobytes() + b'\r\n')
-            time.sleep(0.03)  # ~30 FPS
+            if tracker is None:
+                time.sleep(0.1)
+                continue
+            # Wake when the processing loop stores a frame instead of polling
+            seq, frame = tracker.wait_for_frame(last_seq)
+            if seq == last_seq or frame is None:
+                continue
+            last_seq = seq
+            # Convert to JPEG; RGB888 frames are already BGR in memory
+            ret, jpeg = cv2.imencode('.jpg', frame)
+            if ret:
+                # join() reads the encoded ndarray's buffer directly, no tobytes() copy
+                yield b''.join((MJPEG_PART_HEADER, jpeg, MJPEG_PART_TRAILER))
     
     return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
 